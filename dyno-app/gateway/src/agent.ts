@@ -8,6 +8,7 @@
 
 import Anthropic from "@anthropic-ai/sdk";
 
+import { getAnthropicClient } from "./anthropic-client.js";
 import type { LegacyToolBridge } from "./tools/dyno-legacy.js";
 import type { ToolPermissions } from "./tool-permissions.js";
 import type { ActivityLogger } from "./activity-logger.js";
@@ -100,6 +101,9 @@ const ACTIVATE_TOOLS_DEF: Anthropic.Tool = {
   },
 };
 
+/** Phase 1 tool list — the activate_tools gate alone, shared across calls. */
+const PHASE1_TOOLS: Anthropic.Tool[] = [ACTIVATE_TOOLS_DEF];
+
 // ── Plan system prompt ───────────────────────────────────────────────────────
 
 const PLAN_SYSTEM_PROMPT = `You are a build planner for Marty, an autonomous AI agent.
@@ -117,6 +121,9 @@ Respond with ONLY valid JSON matching this schema:
   "reasoning": "Brief explanation"
 }`;
 
+/** Fallback when the plan isn't bare JSON: pull it out of a ```json fence. */
+const PLAN_JSON_FENCE_RE = /```(?:json)?\s*(\{.*?\})\s*```/s;
+
 // ── GatewayAgent ─────────────────────────────────────────────────────────────
 
 export class GatewayAgent {
@@ -127,6 +134,10 @@ export class GatewayAgent {
   private toolDescriptionsAppendix: string;
   private skillsPrompt: string;
   private soulPrompt: string;
+  // Soul + system prompt and the tool-descriptions/skills suffix only change
+  // through their setters, so compose them once rather than per turn.
+  private basePromptCache: string | null = null;
+  private toolsSuffixCache: string | null = null;
   private orchestration: OrchestrationHandler | null = null;
   private sendFn: SendFn | null = null;
   private userId: string | null = null;
@@ -167,6 +178,7 @@ export class GatewayAgent {
   /** Set the system prompt loaded from context. */
   setSystemPrompt(prompt: string) {
     this.systemPrompt = prompt;
+    this.basePromptCache = null;
   }
 
   /** Get the current system prompt. */
@@ -177,16 +189,38 @@ export class GatewayAgent {
   /** Set tool descriptions appendix for full tool mode. */
   setToolDescriptions(appendix: string) {
     this.toolDescriptionsAppendix = appendix;
+    this.toolsSuffixCache = null;
   }
 
   /** Set skills prompt (only injected in Phase 2 / build, not Phase 1). */
   setSkillsPrompt(prompt: string) {
     this.skillsPrompt = prompt;
+    this.toolsSuffixCache = null;
   }
 
   /** Set soul prompt — prepended to system prompt for persistent identity. */
   setSoulPrompt(prompt: string) {
     this.soulPrompt = prompt;
+    this.basePromptCache = null;
+  }
+
+  /** Soul prompt (when set) followed by the system prompt. */
+  private getBasePrompt(): string {
+    if (this.basePromptCache === null) {
+      this.basePromptCache = this.soulPrompt
+        ? `${this.soulPrompt}\n\n---\n\n${this.systemPrompt}`
+        : this.systemPrompt;
+    }
+    return this.basePromptCache;
+  }
+
+  /** Tool descriptions appendix plus skills prompt, appended in full tool mode. */
+  private getToolsSuffix(): string {
+    if (this.toolsSuffixCache === null) {
+      const skillsBlock = this.skillsPrompt ? `\n\n${this.skillsPrompt}` : "";
+      this.toolsSuffixCache = `\n\n${this.toolDescriptionsAppendix}${skillsBlock}`;
+    }
+    return this.toolsSuffixCache;
   }
 
   /** Set tool permission overrides. */
@@ -354,9 +388,7 @@ export class GatewayAgent {
 
     let systemPrompt = "";
     if (includeSystemContext !== false) {
-      systemPrompt = this.soulPrompt
-        ? `${this.soulPrompt}\n\n---\n\n${this.systemPrompt}`
-        : this.systemPrompt;
+      systemPrompt = this.getBasePrompt();
     }
     if (userId) {
       systemPrompt += `\n\nThe current user's ID is: ${userId}`;
@@ -370,10 +402,9 @@ export class GatewayAgent {
       }
     }
 
-    const chatHistory: Anthropic.MessageParam[] = (history || []).map((m) => ({
-      role: m.role as "user" | "assistant",
-      content: m.content,
-    }));
+    // The frontend already sends { role, content } pairs; both uses below
+    // copy into new arrays, so the list is passed through rather than rebuilt.
+    const chatHistory = (history || []) as Anthropic.MessageParam[];
 
     // Build user message content with optional screenshots
     let userContent: Anthropic.ContentBlockParam[] | string;
@@ -397,18 +428,35 @@ export class GatewayAgent {
 
     console.log(`[gateway] Chat Phase 1: ${prompt.slice(0, 80)}...`);
 
-    const client = new Anthropic({ apiKey });
+    const client = getAnthropicClient(apiKey);
 
-    // Phase 1: Lightweight check with activate_tools gate
+    // Phase 1: Lightweight check with activate_tools gate. Blocks are
+    // classified as they stream in, so the reply text and the gate are known
+    // without walking response.content again afterwards.
     let response: Anthropic.Message;
+    let gateIndex = -1;
+    const textParts: string[] = [];
     try {
-      response = await client.messages.create({
+      const stream = client.messages.stream({
         model: model || this.config.model,
         max_tokens: this.config.maxTokens,
         messages,
-        tools: [ACTIVATE_TOOLS_DEF],
+        tools: PHASE1_TOOLS,
         ...(systemPrompt ? { system: systemPrompt } : {}),
       });
+      for await (const event of stream) {
+        if (event.type === "content_block_start") {
+          const block = event.content_block;
+          if (block.type === "tool_use" && block.name === "activate_tools") {
+            gateIndex = event.index;
+          } else if (block.type === "text" && block.text) {
+            textParts.push(block.text);
+          }
+        } else if (event.type === "content_block_delta" && event.delta.type === "text_delta") {
+          textParts.push(event.delta.text);
+        }
+      }
+      response = await stream.finalMessage();
     } catch (err) {
       await onEvent("error", { message: err instanceof Error ? err.message : String(err) });
       return;
@@ -417,16 +465,9 @@ export class GatewayAgent {
     const phase1In = response.usage?.input_tokens || 0;
     const phase1Out = response.usage?.output_tokens || 0;
 
-    // Check if Claude called activate_tools
-    let toolUseBlock: Anthropic.ToolUseBlock | null = null;
-    const textParts: string[] = [];
-    for (const block of response.content) {
-      if (block.type === "tool_use" && block.name === "activate_tools") {
-        toolUseBlock = block;
-      } else if (block.type === "text") {
-        textParts.push(block.text);
-      }
-    }
+    // The gate's input JSON is only complete in the final message
+    const toolUseBlock =
+      gateIndex >= 0 ? (response.content[gateIndex] as Anthropic.ToolUseBlock) : null;
 
     if (!toolUseBlock) {
       // Simple response — no tools needed
@@ -445,11 +486,8 @@ export class GatewayAgent {
 
     await onEvent("thinking", { text: `Activating tools: ${reason}` });
 
-    const skillsBlock = this.skillsPrompt ? `\n\n${this.skillsPrompt}` : "";
     const permsBlock = `\n\n${this.buildToolPermissionsBlock()}`;
-    const fullSystem = systemPrompt
-      ? `${systemPrompt}\n\n${this.toolDescriptionsAppendix}${skillsBlock}${permsBlock}`
-      : `${this.systemPrompt}\n\n${this.toolDescriptionsAppendix}${skillsBlock}${permsBlock}`;
+    const fullSystem = `${systemPrompt || this.systemPrompt}${this.getToolsSuffix()}${permsBlock}`;
 
     // Build Phase 2 history with Phase 1's tool call
     const phase2History: Anthropic.MessageParam[] = [...chatHistory];
@@ -502,17 +540,13 @@ export class GatewayAgent {
       fullPrompt = prompt + lines.join("\n");
     }
 
-    const skillsBlock = this.skillsPrompt ? `\n\n${this.skillsPrompt}` : "";
     const permsBlock = `\n\n${this.buildToolPermissionsBlock()}`;
-    const basePrompt = this.soulPrompt
-      ? `${this.soulPrompt}\n\n---\n\n${this.systemPrompt}`
-      : this.systemPrompt;
-    let systemPrompt = `${basePrompt}\n\n${this.toolDescriptionsAppendix}${skillsBlock}${permsBlock}`;
+    let systemPrompt = `${this.getBasePrompt()}${this.getToolsSuffix()}${permsBlock}`;
     if (userId) {
       systemPrompt += `\n\nThe current user's ID is: ${userId}`;
     }
 
-    const client = new Anthropic({ apiKey });
+    const client = getAnthropicClient(apiKey);
     console.log(`[gateway] Starting build: ${prompt.slice(0, 80)}...`);
 
     await this.runAgentLoop(client, model || this.config.model, systemPrompt, [], fullPrompt, onEvent, 0, 0, apiKey);
@@ -536,7 +570,7 @@ export class GatewayAgent {
       fullPrompt = prompt + lines.join("\n");
     }
 
-    const client = new Anthropic({ apiKey });
+    const client = getAnthropicClient(apiKey);
     console.log(`[gateway] Planning: ${prompt.slice(0, 80)}...`);
 
     try {
@@ -560,7 +594,7 @@ export class GatewayAgent {
       try {
         plan = JSON.parse(text);
       } catch {
-        const match = text.match(/```(?:json)?\s*(\{.*?\})\s*```/s);
+        const match = PLAN_JSON_FENCE_RE.exec(text);
         if (match) {
           plan = JSON.parse(match[1]);
         } else {
@@ -658,15 +692,29 @@ export class GatewayAgent {
         return;
       }
 
+      // Stream the turn so each text block reaches the frontend as "thinking"
+      // as soon as it completes, rather than after the whole response.
       let response: Anthropic.Message;
       try {
-        response = await client.messages.create({
+        const stream = client.messages.stream({
           model,
           max_tokens: this.config.maxTokens,
           system: cachedSystem,
           tools,
           messages,
         });
+        let text: string | null = null;
+        for await (const event of stream) {
+          if (event.type === "content_block_start") {
+            text = event.content_block.type === "text" ? event.content_block.text : null;
+          } else if (event.type === "content_block_delta") {
+            if (text !== null && event.delta.type === "text_delta") text += event.delta.text;
+          } else if (event.type === "content_block_stop" && text !== null) {
+            await onEvent("thinking", { text });
+            text = null;
+          }
+        }
+        response = await stream.finalMessage();
       } catch (err) {
         await onEvent("error", { message: `API error: ${err instanceof Error ? err.message : String(err)}` });
         return;
@@ -685,13 +733,6 @@ export class GatewayAgent {
         });
       }
 
-      // Stream text blocks as thinking
-      for (const block of response.content) {
-        if (block.type === "text") {
-          await onEvent("thinking", { text: block.text });
-        }
-      }
-
       // If no tool use, the agent wants to finish.
       // But if it did meaningful work without updating core-state, nudge it
       // with one extra turn so it doesn't forget.
@@ -0,0 +1,33 @@
+/**
+ * Shared Anthropic SDK clients, one per API key.
+ *
+ * Each client owns its own HTTP connection pool, so constructing one per
+ * chat/plan/build call paid a fresh TCP + TLS handshake to the API every
+ * time. Reusing the client keeps those sockets warm across requests from the
+ * same user. The cache is a small LRU so rotated or one-off keys age out.
+ */
+
+import Anthropic from "@anthropic-ai/sdk";
+
+const MAX_CLIENTS = 32;
+
+const clients = new Map<string, Anthropic>();
+
+/** Return the cached client for this API key, creating it on first use. */
+export function getAnthropicClient(apiKey: string): Anthropic {
+  let client = clients.get(apiKey);
+  if (client) {
+    // Map iteration order is insertion order — re-insert to mark as recent
+    clients.delete(apiKey);
+    clients.set(apiKey, client);
+    return client;
+  }
+
+  client = new Anthropic({ apiKey });
+  clients.set(apiKey, client);
+  if (clients.size > MAX_CLIENTS) {
+    const oldest = clients.keys().next().value as string;
+    clients.delete(oldest);
+  }
+  return client;
+}
@@ -242,16 +242,21 @@ export class DynoDashboardChannel {
 
   private handleCancel(sessionId: string) {
     if (sessionId === "master") {
-      // Deny all pending approvals
-      for (const [id, pending] of this.pendingApprovals) {
-        clearTimeout(pending.timeout);
-        pending.resolve({ approved: false });
-        this.pendingApprovals.delete(id);
-      }
+      this.denyPendingApprovals();
       this.agent.cancelMaster();
     }
   }
 
+  /** Deny every pending approval and empty the map in one pass. */
+  private denyPendingApprovals() {
+    const pending = [...this.pendingApprovals.values()];
+    this.pendingApprovals.clear();
+    for (const p of pending) {
+      clearTimeout(p.timeout);
+      p.resolve({ approved: false });
+    }
+  }
+
   private handleCancelSession(sessionId: string) {
     this.agent.cancelChild(sessionId);
     this.send({
@@ -271,17 +276,19 @@ export class DynoDashboardChannel {
     type: string,
     payload: Record<string, unknown>
   ): Promise<{ approved: boolean; editedInput?: Record<string, string> } | null> {
-    const outPayload = { ...payload, sessionId };
+    // One outbound object per event: the frontend message, the thinking
+    // buffer and the pending-approval record all share it.
+    const event = { type, ...payload, sessionId };
 
     switch (type) {
       case "thinking":
-        this.send({ type: "thinking", ...outPayload });
-        this.bufferThinkingEvent(sessionId, { type: "thinking", ...outPayload });
+        this.send(event);
+        this.bufferThinkingEvent(sessionId, event);
         return null;
 
       case "tool_call":
-        this.send({ type: "tool_call", ...outPayload });
-        this.bufferThinkingEvent(sessionId, { type: "tool_call", ...outPayload });
+        this.send(event);
+        this.bufferThinkingEvent(sessionId, event);
         // Track start time for duration calculation
         if (payload.id) {
           this.toolCallTimestamps.set(payload.id as string, {
@@ -293,8 +300,8 @@ export class DynoDashboardChannel {
         return null;
 
       case "tool_result":
-        this.send({ type: "tool_result", ...outPayload });
-        this.bufferThinkingEvent(sessionId, { type: "tool_result", ...outPayload });
+        this.send(event);
+        this.bufferThinkingEvent(sessionId, event);
         // Log tool call to activity logger
         if (this.activityLogger && this.userId && payload.id) {
           const start = this.toolCallTimestamps.get(payload.id as string);
@@ -314,7 +321,7 @@ export class DynoDashboardChannel {
 
       case "proposal": {
         // Send proposal to frontend and wait for approval
-        this.send({ type: "proposal", ...outPayload });
+        this.send(event);
 
         return new Promise((resolve) => {
           const proposalId = payload.id as string;
@@ -330,16 +337,16 @@ export class DynoDashboardChannel {
             });
           }, APPROVAL_TIMEOUT_MS);
 
-          this.pendingApprovals.set(proposalId, { resolve, timeout, payload: { type: "proposal", ...outPayload } });
+          this.pendingApprovals.set(proposalId, { resolve, timeout, payload: event });
         });
       }
 
       case "execution_result":
-        this.send({ type: "execution_result", ...outPayload });
+        this.send(event);
         return null;
 
       case "token_usage":
-        this.send({ type: "token_usage", ...outPayload });
+        this.send(event);
         // Log token usage to hourly rollup
         if (this.activityLogger && this.userId) {
           const deltaIn = (payload.deltaIn as number) || (payload.tokensIn as number) || 0;
@@ -364,42 +371,42 @@ export class DynoDashboardChannel {
             tokensOut: payload.tokensOut || 0,
           });
         } else {
-          this.send({ type: "done", ...outPayload });
+          this.send(event);
         }
         return null;
 
       case "chat_response":
         this.thinkingBuffer.delete(sessionId);
-        this.send({ type: "chat_response", ...outPayload });
+        this.send(event);
         return null;
 
       case "plan_result":
-        this.send({ type: "plan_result", ...outPayload });
+        this.send(event);
         return null;
 
       case "session_created":
-        this.send({ type: "session_created", ...outPayload });
+        this.send(event);
         return null;
 
       case "session_ended":
-        this.send({ type: "session_ended", ...outPayload });
+        this.send(event);
         return null;
 
       case "session_status":
-        this.send({ type: "session_status", ...outPayload });
+        this.send(event);
         return null;
 
       case "ui_mutation":
-        this.send({ type: "ui_mutation", ...outPayload });
+        this.send(event);
         return null;
 
       case "error":
-        this.send({ type: "error", ...outPayload });
+        this.send(event);
         return null;
 
       default:
         // Pass through unknown event types
-        this.send({ type, ...outPayload });
+        this.send(event);
         return null;
     }
   }
@@ -469,7 +476,7 @@ export class DynoDashboardChannel {
     }
 
     // Re-send pending proposals to the new frontend so user can approve/deny
-    for (const [, pending] of this.pendingApprovals) {
+    for (const pending of this.pendingApprovals.values()) {
       this.send(pending.payload);
     }
   }
@@ -480,10 +487,6 @@ export class DynoDashboardChannel {
   }
 
   cleanup() {
-    for (const [id, pending] of this.pendingApprovals) {
-      clearTimeout(pending.timeout);
-      pending.resolve({ approved: false });
-    }
-    this.pendingApprovals.clear();
+    this.denyPendingApprovals();
   }
 }
@@ -14,6 +14,8 @@ import { createClient, type SupabaseClient } from "@supabase/supabase-js";
 import { readFileSync } from "fs";
 import { resolve } from "path";
 
+import { getAnthropicClient } from "./anthropic-client.js";
+
 import type { GatewayAgent, EventCallback } from "./agent.js";
 import type { AgentManager } from "./agent-manager.js";
 import type { ActivityLogger } from "./activity-logger.js";
@@ -317,7 +319,7 @@ export class HeartbeatDaemon {
     soulContent: string,
     model: string
   ): Promise<TriageResult> {
-    const client = new Anthropic({ apiKey });
+    const client = getAnthropicClient(apiKey);
 
     // Triage is a cheap yes/no — only needs soul.md for personality, not the full claude.md
     const systemPrompt =
@@ -77,7 +77,7 @@ function loadConfig(): GatewayConfig {
 // ── State ────────────────────────────────────────────────────────────────────
 
 let activeConnections = 0;
-const serverStartTime = Date.now();
+const serverStartTime = performance.now(); // monotonic — uptime is immune to wall-clock steps
 
 // Per-user channel map: allows WebSocket hot-swap on page reload
 const userChannels = new Map<string, DynoDashboardChannel>();
@@ -124,7 +124,7 @@ function handleHealthCheck(
 
   const body = JSON.stringify({
     status: "ok",
-    uptime: Math.floor((Date.now() - serverStartTime) / 1000),
+    uptime: Math.floor((performance.now() - serverStartTime) / 1000),
     activeConnections,
     activeAgents: ctx.agentManager.getActiveCount(),
     backend: "openclaw-gateway",
@@ -7,6 +7,7 @@
 
 import Anthropic from "@anthropic-ai/sdk";
 import { v4 as uuidv4 } from "uuid";
+import { getAnthropicClient } from "./anthropic-client.js";
 import type { ActivityLogger } from "./activity-logger.js";
 import type { LayoutStore } from "./layout-store.js";
 
@@ -437,7 +438,7 @@ export class OrchestrationHandler {
     apiKey: string,
     parentOnEvent: EventCallback
   ): Promise<void> {
-    const client = new Anthropic({ apiKey });
+    const client = getAnthropicClient(apiKey);
 
     // Child gets legacy tools (minus orchestration dupes) + dashboard orchestration tools (no spawning)
     const filteredLegacy = this.getAgentTools().filter(
@@ -9,10 +9,19 @@ Protocol: JSON-RPC 2.0 over WebSocket
 - tools/call -> executes a tool and returns the result
 """
 
+import sys
+
+# asyncio.TaskGroup / asyncio.Runner(loop_factory=...) need 3.11
+if sys.version_info < (3, 11):
+    sys.exit(
+        f"mcp_server.py requires Python 3.11+ (running {sys.version.split()[0]})"
+    )
+
 import asyncio
-import json
+import logging
+import logging.handlers
 import os
-import sys
+import queue
 from pathlib import Path
 
 import websockets
@@ -23,14 +32,52 @@ from http import HTTPStatus
 # Ensure tools package is importable
 sys.path.insert(0, str(Path(__file__).parent))
 
-from tools import AGENT_TOOLS, TOOL_HANDLERS, READ_ONLY_TOOLS, reload_tools
+from tools import AGENT_TOOLS, TOOL_HANDLERS, READ_ONLY_TOOLS, reload_tools, tools_version
+from tools._common import JSONDecodeError, json_dumps, json_loads
+from tools._http import close_client
+
+try:
+    import uvloop  # libuv-based event loop — faster socket I/O than asyncio's default
+except ImportError:
+    uvloop = None
 
 PORT = int(os.getenv("MCP_PORT", "18790"))
 HOST = os.getenv("MCP_HOST", "localhost")
 
+log = logging.getLogger("mcp")
+
+
+def _start_logging() -> logging.handlers.QueueListener:
+    """Route server log records through a queue to a background writer.
+
+    Handlers only enqueue records; the stdout write happens on the listener's
+    thread, so a slow terminal or pipe never stalls the event loop.
+    """
+    log_q: queue.SimpleQueue = queue.SimpleQueue()
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_q, handler)
+    log.addHandler(logging.handlers.QueueHandler(log_q))
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    listener.start()
+    return listener
+
+
+# (tools_version, tools list) — rebuilt only when reload_tools() saw a change
+_tools_list_cache: tuple[int, list[dict]] | None = None
+
+# (tools_version, JSON-encoded tools array) — serialized once per tool set
+_tools_json_cache: tuple[int, bytes] | None = None
+
 
 def _build_tools_list() -> list[dict]:
     """Build the MCP tools list from loaded Python tools."""
+    global _tools_list_cache
+    version = tools_version()
+    if _tools_list_cache is not None and _tools_list_cache[0] == version:
+        return _tools_list_cache[1]
+
     tools = []
     for tool_def in AGENT_TOOLS:
         tools.append({
@@ -39,22 +86,90 @@ def _build_tools_list() -> list[dict]:
             "input_schema": tool_def.get("input_schema", {"type": "object", "properties": {}}),
             "mode": "auto" if tool_def["name"] in READ_ONLY_TOOLS else "manual",
         })
+    _tools_list_cache = (version, tools)
     return tools
 
 
-async def handle_rpc(websocket):
-    """Handle JSON-RPC requests from the Gateway."""
-    print(f"[mcp] Client connected from {websocket.remote_address}")
+def _tools_list_json() -> bytes:
+    """Return the tools list as a JSON array, serialized once per tool set."""
+    global _tools_json_cache
+    version = tools_version()
+    if _tools_json_cache is not None and _tools_json_cache[0] == version:
+        return _tools_json_cache[1]
+
+    encoded = json_dumps(_build_tools_list())
+    _tools_json_cache = (version, encoded)
+    return encoded
+
+
+# Frames written back-to-back per writer wake-up
+_SEND_BATCH = 64
+
+
+def _error_frame(req_id, code: int, message: str) -> bytes:
+    """Frame a JSON-RPC error reply; only the message and id need encoding."""
+    return (
+        b'{"jsonrpc":"2.0","error":{"code":%d,"message":' % code
+        + json_dumps(message) + b'},"id":' + json_dumps(req_id) + b'}'
+    )
+
+
+# Parse errors and non-object requests carry no id, so the whole frame is constant
+_PARSE_ERROR_FRAME = _error_frame(None, -32700, "Parse error")
+_INVALID_REQUEST_FRAME = _error_frame(None, -32600, "Invalid Request")
+
+
+def _result_frame(req_id, result_json: bytes) -> bytes:
+    """Frame an already-encoded result in a JSON-RPC success envelope.
+
+    The envelope layout is fixed, so only the result and id are encoded;
+    no per-reply dict is built around them.
+    """
+    return b'{"jsonrpc":"2.0","result":' + result_json + b',"id":' + json_dumps(req_id) + b'}'
 
+
+async def _writer(websocket, send_q: asyncio.Queue[bytes]) -> None:
+    """Drain the connection's outbound queue.
+
+    Replies from concurrently running tool calls are queued rather than each
+    awaiting websocket.send() itself; whatever is ready when the writer wakes
+    is written out in one pass.
+    """
+    while True:
+        batch = [await send_q.get()]
+        while len(batch) < _SEND_BATCH and not send_q.empty():
+            batch.append(send_q.get_nowait())
+        try:
+            for frame in batch:
+                # Already UTF-8: send as a text frame without a str round-trip
+                await websocket.send(frame, text=True)
+        except websockets.ConnectionClosed:
+            return
+
+
+async def _call_tool(send_q: asyncio.Queue[bytes], req_id, handler, tool_args) -> None:
+    """Run one tools/call handler and queue its JSON-RPC response.
+
+    Runs as a TaskGroup child, so it must never raise: any failure becomes an
+    error reply instead of tearing down the connection's other calls.
+    """
+    try:
+        result = await handler(tool_args)
+        send_q.put_nowait(_result_frame(req_id, json_dumps(result)))
+    except Exception as e:
+        send_q.put_nowait(_error_frame(req_id, -32000, f"Tool execution error: {str(e)}"))
+
+
+async def _serve_requests(websocket, send_q: asyncio.Queue[bytes], tg: asyncio.TaskGroup) -> None:
+    """Read requests until the Gateway disconnects, queueing or spawning replies."""
     async for raw in websocket:
         try:
-            request = json.loads(raw)
-        except json.JSONDecodeError:
-            await websocket.send(json.dumps({
-                "jsonrpc": "2.0",
-                "error": {"code": -32700, "message": "Parse error"},
-                "id": None,
-            }))
+            request = json_loads(raw)
+        except JSONDecodeError:
+            send_q.put_nowait(_PARSE_ERROR_FRAME)
+            continue
+        if not isinstance(request, dict):
+            send_q.put_nowait(_INVALID_REQUEST_FRAME)
             continue
 
         req_id = request.get("id")
@@ -65,106 +180,130 @@ async def handle_rpc(websocket):
             if method == "tools/list":
                 # Reload tools to pick up any changes
                 reload_tools()
-                tools = _build_tools_list()
-                await websocket.send(json.dumps({
-                    "jsonrpc": "2.0",
-                    "result": {"tools": tools},
-                    "id": req_id,
-                }))
+                # Splice the pre-serialized manifest into the envelope
+                # instead of re-encoding every tool schema per request.
+                send_q.put_nowait(_result_frame(
+                    req_id, b'{"tools":' + _tools_list_json() + b'}'
+                ))
 
             elif method == "tools/call":
+                # Resolve the handler here, inside this try, so malformed
+                # params get a -32603 reply rather than failing in the task.
                 tool_name = params.get("name", "")
-                tool_args = params.get("arguments", {})
-
                 handler = TOOL_HANDLERS.get(tool_name)
                 if not handler:
-                    await websocket.send(json.dumps({
-                        "jsonrpc": "2.0",
-                        "error": {
-                            "code": -32601,
-                            "message": f"Unknown tool: {tool_name}",
-                        },
-                        "id": req_id,
-                    }))
-                    continue
-
-                # Execute the tool handler
-                try:
-                    result = await handler(tool_args)
-                    await websocket.send(json.dumps({
-                        "jsonrpc": "2.0",
-                        "result": result,
-                        "id": req_id,
-                    }))
-                except Exception as e:
-                    await websocket.send(json.dumps({
-                        "jsonrpc": "2.0",
-                        "error": {
-                            "code": -32000,
-                            "message": f"Tool execution error: {str(e)}",
-                        },
-                        "id": req_id,
-                    }))
+                    send_q.put_nowait(_error_frame(req_id, -32601, f"Unknown tool: {tool_name}"))
+                else:
+                    tool_args = params.get("arguments", {})
+                    tg.create_task(_call_tool(send_q, req_id, handler, tool_args))
 
             else:
-                await websocket.send(json.dumps({
-                    "jsonrpc": "2.0",
-                    "error": {
-                        "code": -32601,
-                        "message": f"Method not found: {method}",
-                    },
-                    "id": req_id,
-                }))
+                send_q.put_nowait(_error_frame(req_id, -32601, f"Method not found: {method}"))
 
         except Exception as e:
-            print(f"[mcp] Error handling {method}: {e}")
-            await websocket.send(json.dumps({
-                "jsonrpc": "2.0",
-                "error": {
-                    "code": -32603,
-                    "message": f"Internal error: {str(e)}",
-                },
-                "id": req_id,
-            }))
+            log.warning("[mcp] Error handling %s: %s", method, e)
+            send_q.put_nowait(_error_frame(req_id, -32603, f"Internal error: {str(e)}"))
+
+
+class _Disconnected(Exception):
+    """Raised inside handle_rpc's TaskGroup to tear down the connection's tasks."""
+
+
+async def handle_rpc(websocket):
+    """Handle JSON-RPC requests from the Gateway.
+
+    tools/call requests run as independent tasks, so a slow tool doesn't hold
+    up the calls behind it; the Gateway matches responses to requests by id.
+    """
+    log.info("[mcp] Client connected from %s", websocket.remote_address)
+
+    send_q: asyncio.Queue[bytes] = asyncio.Queue()
+
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(_writer(websocket, send_q))
+            try:
+                await _serve_requests(websocket, send_q, tg)
+            except websockets.ConnectionClosedError as e:
+                # The Gateway went away without a close handshake (restart, dropped
+                # socket). Routine — log one line instead of letting websockets
+                # report it as a handler failure with a full traceback.
+                log.info("[mcp] Client connection lost: %s", e)
+            # The Gateway is gone — nobody is left to receive these replies.
+            # Raising out of the group cancels the writer and in-flight calls.
+            raise _Disconnected
+    except ExceptionGroup as eg:
+        # Swallow our own teardown signal; re-raise anything a task raised
+        _, rest = eg.split(_Disconnected)
+        if rest is not None:
+            raise rest
+
+
+# (tools_version, body, headers) — the /health reply only changes with the tool set
+_health_cache: tuple[int, bytes, list[tuple[str, str]]] | None = None
+
+
+def _health_response() -> tuple[bytes, list[tuple[str, str]]]:
+    global _health_cache
+    version = tools_version()
+    if _health_cache is not None and _health_cache[0] == version:
+        return _health_cache[1], _health_cache[2]
+
+    body = json_dumps({
+        "status": "ok",
+        "backend": "marty-mcp-server",
+        "tools": len(AGENT_TOOLS),
+    })
+    headers = [
+        ("Content-Type", "application/json"),
+        ("Content-Length", str(len(body))),
+        ("Access-Control-Allow-Origin", "*"),
+        ("Connection", "close"),
+    ]
+    _health_cache = (version, body, headers)
+    return body, headers
 
 
 def health_check(_connection, request):
     """HTTP health check on the same port."""
     if request.path == "/health":
         reload_tools()
-        body = json.dumps({
-            "status": "ok",
-            "backend": "marty-mcp-server",
-            "tools": len(AGENT_TOOLS),
-        }).encode()
-        return Response(
-            HTTPStatus.OK,
-            "OK",
-            Headers([
-                ("Content-Type", "application/json"),
-                ("Content-Length", str(len(body))),
-                ("Access-Control-Allow-Origin", "*"),
-                ("Connection", "close"),
-            ]),
-            body,
-        )
+        body, headers = _health_response()
+        return Response(HTTPStatus.OK, "OK", Headers(headers), body)
     return None
 
 
 async def main():
     n = reload_tools()
-    print(f"[mcp] Loaded {n} tools")
+    log.info("[mcp] Loaded %d tools", n)
 
-    async with websockets.serve(
-        handle_rpc,
-        HOST,
-        PORT,
-        process_request=health_check,
-    ):
-        print(f"MCP server running on ws://{HOST}:{PORT}")
-        print(f"Health check at http://{HOST}:{PORT}/health")
-        await asyncio.Future()  # Run forever
+    try:
+        async with websockets.serve(
+            handle_rpc,
+            HOST,
+            PORT,
+            process_request=health_check,
+            # Replies are small, already-compact JSON on a localhost link —
+            # per-message deflate would only burn CPU on every frame.
+            compression=None,
+            # Tighter than the 20s/20s default so a Gateway that vanished
+            # mid-build is noticed (and its calls cancelled) within ~20s.
+            ping_interval=10,
+            ping_timeout=10,
+            write_limit=2**16,
+        ):
+            log.info("MCP server running on ws://%s:%d", HOST, PORT)
+            log.info("Health check at http://%s:%d/health", HOST, PORT)
+            await asyncio.Future()  # Run forever
+    finally:
+        await close_client()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    listener = _start_logging()
+    loop_factory = uvloop.new_event_loop if uvloop is not None else None
+    try:
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(main())
+    finally:
+        listener.stop()
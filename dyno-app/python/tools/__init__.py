@@ -24,17 +24,35 @@ AGENT_TOOLS: list[dict] = []
 TOOL_HANDLERS: dict[str, object] = {}
 READ_ONLY_TOOLS: set[str] = set()
 
+# module name -> source mtime (ns) of every successfully loaded skill module
+_module_mtimes: dict[str, int] = {}
+_version = 0
+
+
+def tools_version() -> int:
+    """Return a counter that changes whenever the loaded tool set changes.
+
+    Lets callers cache anything derived from AGENT_TOOLS (e.g. serialized
+    tool manifests) and rebuild it only after reload_tools() picked up
+    a new, modified, or deleted skill.
+    """
+    return _version
+
 
 def reload_tools() -> int:
     """Discover and (re)load all skill modules in the tools/ directory.
 
     Returns the number of tools loaded. Safe to call repeatedly —
     picks up new files, reloads modified ones, and removes tools
-    from deleted modules.
+    from deleted modules. Modules whose source hasn't changed since
+    the last load are reused as-is.
     """
+    global _module_mtimes, _version
+
     new_tools: list[dict] = []
     new_handlers: dict[str, object] = {}
     new_read_only: set[str] = set()
+    new_mtimes: dict[str, int] = {}
 
     for py_file in sorted(_TOOLS_DIR.glob("*.py")):
         if py_file.stem in _SKIP or py_file.stem.startswith("_"):
@@ -43,8 +61,12 @@ def reload_tools() -> int:
         module_name = f"tools.{py_file.stem}"
 
         try:
+            mtime = py_file.stat().st_mtime_ns
             if module_name in sys.modules:
-                mod = importlib.reload(sys.modules[module_name])
+                if _module_mtimes.get(module_name) == mtime:
+                    mod = sys.modules[module_name]
+                else:
+                    mod = importlib.reload(sys.modules[module_name])
             else:
                 mod = importlib.import_module(module_name)
 
@@ -54,6 +76,7 @@ def reload_tools() -> int:
                 new_handlers.update(mod.HANDLERS)
             if hasattr(mod, "READ_ONLY"):
                 new_read_only.update(mod.READ_ONLY)
+            new_mtimes[module_name] = mtime
         except Exception as e:
             # Don't crash the server if a skill has errors — log and skip
             print(f"[tools] Error loading {py_file.name}: {e}")
@@ -65,6 +88,10 @@ def reload_tools() -> int:
     READ_ONLY_TOOLS.clear()
     READ_ONLY_TOOLS.update(new_read_only)
 
+    if new_mtimes != _module_mtimes:
+        _module_mtimes = new_mtimes
+        _version += 1
+
     return len(AGENT_TOOLS)
 
 
@@ -76,6 +103,7 @@ __all__ = [
     "TOOL_HANDLERS",
     "READ_ONLY_TOOLS",
     "reload_tools",
+    "tools_version",
     "DATA_DIR",
     "TOOLS_DIR",
     "SCREENSHOTS_DIR",
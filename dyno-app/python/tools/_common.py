@@ -1,8 +1,35 @@
 """Shared constants and helpers for all tool modules."""
 
+import json
 import os
 from pathlib import Path
 
+# ── JSON (orjson when installed, stdlib otherwise) ─────────────────────────
+try:
+    import orjson
+
+    def json_dumps(obj) -> bytes:
+        """Serialize to compact UTF-8 JSON bytes."""
+        return orjson.dumps(obj)
+
+    def json_dumps_pretty(obj) -> bytes:
+        """Serialize to 2-space indented UTF-8 JSON bytes for display."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    json_loads = orjson.loads
+    JSONDecodeError = orjson.JSONDecodeError
+except ImportError:
+    def json_dumps(obj) -> bytes:
+        """Serialize to compact UTF-8 JSON bytes."""
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    def json_dumps_pretty(obj) -> bytes:
+        """Serialize to 2-space indented UTF-8 JSON bytes for display."""
+        return json.dumps(obj, indent=2).encode()
+
+    json_loads = json.loads
+    JSONDecodeError = json.JSONDecodeError
+
 # Everything lives inside the project: dyno-app/
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent  # dyno-app/
 
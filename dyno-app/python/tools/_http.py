@@ -0,0 +1,99 @@
+"""Shared async HTTP client for all tool modules.
+
+A single httpx.AsyncClient is created lazily and reused for the lifetime of
+the process, so repeated tool calls to the same host share keep-alive
+connections (and HTTP/2 streams when the `h2` package is installed) instead
+of paying a fresh TCP + TLS handshake per request.
+"""
+
+import ipaddress
+import urllib.request
+
+import httpx
+
+try:
+    import h2  # noqa: F401 — httpx only needs it to be importable
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60)
+
+# Retry opening a new connection (ConnectError / ConnectTimeout) so a briefly
+# unreachable upstream doesn't surface as a tool error. Requests already sent
+# on a pooled connection are never retried.
+_CONNECT_RETRIES = 2
+
+_client: httpx.AsyncClient | None = None
+
+
+def _transport(proxy: str | None = None) -> httpx.AsyncHTTPTransport:
+    return httpx.AsyncHTTPTransport(
+        http2=_HTTP2,
+        limits=_LIMITS,
+        retries=_CONNECT_RETRIES,
+        proxy=proxy,
+    )
+
+
+def _proxy_mounts() -> dict[str, httpx.AsyncHTTPTransport | None]:
+    """Mount HTTP(S)_PROXY / ALL_PROXY / NO_PROXY from the environment.
+
+    httpx only applies environment proxies when it builds the transport
+    itself; passing our own transport turns that off, so build the same
+    pattern table here. A None mount means "no proxy" (the default transport).
+    """
+    proxies = urllib.request.getproxies()
+    mounts: dict[str, httpx.AsyncHTTPTransport | None] = {}
+
+    for scheme in ("http", "https", "all"):
+        url = proxies.get(scheme)
+        if url:
+            mounts[f"{scheme}://"] = _transport(url if "://" in url else f"http://{url}")
+
+    # NO_PROXY follows curl's rules: "*" disables proxying entirely, a bare
+    # name also matches its subdomains, ".example.com" only the subdomains.
+    for host in proxies.get("no", "").split(","):
+        host = host.strip()
+        if host == "*":
+            return {}
+        if not host:
+            continue
+        if "://" in host:
+            mounts[host] = None
+        elif _is_ip(host):
+            mounts[f"all://[{host}]" if ":" in host else f"all://{host}"] = None
+        elif host.lower() == "localhost":
+            mounts[f"all://{host}"] = None
+        else:
+            mounts[f"all://*{host}"] = None
+    return mounts
+
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.split("/")[0])
+    except ValueError:
+        return False
+    return True
+
+
+async def get_client() -> httpx.AsyncClient:
+    """Return the process-wide AsyncClient, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            transport=_transport(),
+            mounts=_proxy_mounts(),
+            timeout=10.0,
+            follow_redirects=True,
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client. Called by the server on shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -3,12 +3,12 @@
 import asyncio
 import json
 import re
-import urllib.request
 import urllib.parse
-import urllib.error
 from html.parser import HTMLParser
 from pathlib import Path
 
+from ._http import get_client
+
 
 # ── Web search (no API key needed, uses DuckDuckGo HTML) ────────────────────
 
@@ -65,9 +65,10 @@ async def handle_web_search(input_data: dict) -> str:
     }
 
     try:
-        req = urllib.request.Request(url, headers=headers)
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            html = resp.read().decode("utf-8", errors="replace")
+        client = await get_client()
+        resp = await client.get(url, headers=headers, timeout=15)
+        resp.raise_for_status()
+        html = resp.content.decode("utf-8", errors="replace")
 
         parser = _DDGResultParser()
         parser.feed(html)
@@ -4,13 +4,10 @@ Allows the agent to retrieve third-party API keys/tokens stored
 by the user in the Credential Vault (Settings page).
 """
 
-import json
 import os
-import urllib.request
-import urllib.parse
-import urllib.error
 
-from ._common import FRONTEND_URL, service_headers
+from ._common import FRONTEND_URL, JSONDecodeError, json_dumps, json_loads, service_headers
+from ._http import get_client
 
 # Gateway URL for credential retrieval (internal calls — always localhost)
 _GATEWAY_HTTP = os.getenv("GATEWAY_INTERNAL_URL", "http://localhost:18789")
@@ -69,26 +66,25 @@ async def handle_get_credential(input_data: dict) -> str:
     if not name:
         return "Error: credential name is required"
 
-    payload = json.dumps({"userId": user_id, "name": name}).encode()
-    req = urllib.request.Request(
-        f"{_GATEWAY_HTTP}/api/credentials/retrieve",
-        data=payload,
-        headers=service_headers({"Content-Type": "application/json"}),
-        method="POST",
-    )
+    payload = json_dumps({"userId": user_id, "name": name})
 
     try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            result = json.loads(resp.read())
-            value = result.get("value", "")
-            return value
-    except urllib.error.HTTPError as e:
-        body = e.read().decode()
-        try:
-            err = json.loads(body)
-            return f"Error: {err.get('error', body)}"
-        except json.JSONDecodeError:
-            return f"Error: {body}"
+        client = await get_client()
+        resp = await client.post(
+            f"{_GATEWAY_HTTP}/api/credentials/retrieve",
+            content=payload,
+            headers=service_headers({"Content-Type": "application/json"}),
+        )
+        if resp.status_code >= 400:
+            body = resp.text
+            try:
+                err = json_loads(body)
+                return f"Error: {err.get('error', body)}"
+            except JSONDecodeError:
+                return f"Error: {body}"
+        result = json_loads(resp.content)
+        value = result.get("value", "")
+        return value
     except Exception as e:
         return f"Error retrieving credential: {str(e)}"
 
@@ -100,17 +96,21 @@ async def handle_list_credentials(input_data: dict) -> str:
         return "Error: userId is required"
 
     try:
-        url = f"{_GATEWAY_HTTP}/api/credentials?userId={urllib.parse.quote(user_id)}"
-        list_req = urllib.request.Request(url, headers=service_headers())
-        with urllib.request.urlopen(list_req, timeout=10) as resp:
-            result = json.loads(resp.read())
-            credentials = result.get("credentials", [])
-
-            if not credentials:
-                return "No credentials stored. Add credentials in Settings > Credential Vault."
-
-            names = [c["credential_name"] for c in credentials]
-            return "Stored credentials: " + ", ".join(names)
+        client = await get_client()
+        resp = await client.get(
+            f"{_GATEWAY_HTTP}/api/credentials",
+            params={"userId": user_id},
+            headers=service_headers(),
+        )
+        resp.raise_for_status()
+        result = json_loads(resp.content)
+        credentials = result.get("credentials", [])
+
+        if not credentials:
+            return "No credentials stored. Add credentials in Settings > Credential Vault."
+
+        names = [c["credential_name"] for c in credentials]
+        return "Stored credentials: " + ", ".join(names)
     except Exception as e:
         return f"Error listing credentials: {str(e)}"
 
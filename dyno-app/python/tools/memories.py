@@ -4,31 +4,29 @@ Memories are stored in the cloud (Supabase) and retrieved on-demand,
 so they don't bloat the system prompt.
 """
 
-import json
 import os
-import urllib.request
-import urllib.parse
-import urllib.error
+from contextvars import ContextVar
 
-from ._common import FRONTEND_URL, service_headers
+from ._common import FRONTEND_URL, json_dumps, json_loads, service_headers
+from ._http import get_client
 
 API_BASE = FRONTEND_URL + "/api/memories"
 
-# Set by ws_server before each session — the authenticated user's ID
-_current_user_id: str | None = None
+# Set by the server before each session — the authenticated user's ID. A
+# ContextVar, so concurrent tool calls for different users each see their own.
+_current_user_id: ContextVar[str | None] = ContextVar("memory_user_id", default=None)
 
 
 def set_user_id(user_id: str):
     """Called by the server to set the user context for memory operations."""
-    global _current_user_id
-    _current_user_id = user_id
+    _current_user_id.set(user_id)
 
 
 def _get_user_id(input_data: dict | None = None) -> str:
-    """Get user ID from tool input (preferred) or module-level fallback."""
+    """Get user ID from tool input (preferred) or the per-task fallback."""
     if input_data and input_data.get("userId"):
         return input_data["userId"]
-    return _current_user_id or ""
+    return _current_user_id.get() or ""
 
 
 TOOL_DEFS = [
@@ -121,22 +119,20 @@ async def handle_save_memory(input_data: dict) -> str:
     if not tag or not content:
         return "Error: tag and content are required"
 
-    payload = json.dumps({"userId": user_id, "tag": tag, "content": content}).encode()
-    req = urllib.request.Request(
-        API_BASE,
-        data=payload,
-        headers=service_headers({"Content-Type": "application/json"}),
-        method="POST",
-    )
+    payload = json_dumps({"userId": user_id, "tag": tag, "content": content})
 
     try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            result = json.loads(resp.read())
-            action = result.get("action", "saved")
-            return f"Memory '{tag}' {action} successfully."
-    except urllib.error.HTTPError as e:
-        body = e.read().decode()
-        return f"Error saving memory: {body}"
+        client = await get_client()
+        resp = await client.post(
+            API_BASE,
+            content=payload,
+            headers=service_headers({"Content-Type": "application/json"}),
+        )
+        if resp.status_code >= 400:
+            return f"Error saving memory: {resp.text}"
+        result = json_loads(resp.content)
+        action = result.get("action", "saved")
+        return f"Memory '{tag}' {action} successfully."
     except Exception as e:
         return f"Error saving memory: {str(e)}"
 
@@ -152,30 +148,29 @@ async def handle_recall_memories(input_data: dict) -> str:
     if query:
         params["q"] = query
 
-    url = f"{API_BASE}?{urllib.parse.urlencode(params)}"
-    recall_req = urllib.request.Request(url, headers=service_headers())
-
     try:
-        with urllib.request.urlopen(recall_req, timeout=10) as resp:
-            result = json.loads(resp.read())
-            memories = result.get("memories", [])
-
-            if not memories:
-                if tag:
-                    return f"No memory found with tag '{tag}'."
-                if query:
-                    return f"No memories matching '{query}'."
-                return "No memories saved yet."
-
-            # No tag/query: return lightweight tag list only
-            if not tag and not query:
-                tags = [m["tag"] for m in memories]
-                return "Available tags: " + ", ".join(tags)
-
-            lines = []
-            for m in memories:
-                lines.append(f"[{m['tag']}] {m['content']}")
-            return "\n---\n".join(lines)
+        client = await get_client()
+        resp = await client.get(API_BASE, params=params, headers=service_headers())
+        resp.raise_for_status()
+        result = json_loads(resp.content)
+        memories = result.get("memories", [])
+
+        if not memories:
+            if tag:
+                return f"No memory found with tag '{tag}'."
+            if query:
+                return f"No memories matching '{query}'."
+            return "No memories saved yet."
+
+        # No tag/query: return lightweight tag list only
+        if not tag and not query:
+            tags = [m["tag"] for m in memories]
+            return "Available tags: " + ", ".join(tags)
+
+        lines = []
+        for m in memories:
+            lines.append(f"[{m['tag']}] {m['content']}")
+        return "\n---\n".join(lines)
     except Exception as e:
         return f"Error recalling memories: {str(e)}"
 
@@ -187,17 +182,16 @@ async def handle_delete_memory(input_data: dict) -> str:
     if not tag:
         return "Error: tag is required"
 
-    params = urllib.parse.urlencode({"userId": user_id, "tag": tag})
-    url = f"{API_BASE}?{params}"
-
-    req = urllib.request.Request(url, method="DELETE", headers=service_headers())
-
     try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            return f"Memory '{tag}' deleted."
-    except urllib.error.HTTPError as e:
-        body = e.read().decode()
-        return f"Error deleting memory: {body}"
+        client = await get_client()
+        resp = await client.delete(
+            API_BASE,
+            params={"userId": user_id, "tag": tag},
+            headers=service_headers(),
+        )
+        if resp.status_code >= 400:
+            return f"Error deleting memory: {resp.text}"
+        return f"Memory '{tag}' deleted."
     except Exception as e:
         return f"Error deleting memory: {str(e)}"
 
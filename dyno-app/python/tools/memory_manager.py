@@ -3,13 +3,12 @@
 Uses the same Next.js API as memories.py for memory CRUD operations.
 """
 
-import json
 import os
-import urllib.request
-import urllib.parse
-import urllib.error
 
-from ._common import FRONTEND_URL, service_headers
+import httpx
+
+from ._common import FRONTEND_URL, json_dumps, json_loads, service_headers
+from ._http import get_client
 
 API_BASE = FRONTEND_URL + "/api/memories"
 
@@ -84,31 +83,34 @@ TOOL_DEFS = [
 ]
 
 
-def _fetch_memory(user_id: str, tag: str) -> dict | None:
+async def _fetch_memory(user_id: str, tag: str) -> dict | None:
     """Fetch a single memory by tag via the API. Returns None if not found."""
-    params = urllib.parse.urlencode({"userId": user_id, "tag": tag})
-    url = f"{API_BASE}?{params}"
     try:
-        req = urllib.request.Request(url, headers=service_headers())
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            result = json.loads(resp.read())
-            memories = result.get("memories", [])
-            return memories[0] if memories else None
+        client = await get_client()
+        resp = await client.get(
+            API_BASE,
+            params={"userId": user_id, "tag": tag},
+            headers=service_headers(),
+        )
+        resp.raise_for_status()
+        result = json_loads(resp.content)
+        memories = result.get("memories", [])
+        return memories[0] if memories else None
     except Exception:
         return None
 
 
-def _save_memory(user_id: str, tag: str, content: str) -> dict:
+async def _save_memory(user_id: str, tag: str, content: str) -> dict:
     """Create or update a memory via the API."""
-    payload = json.dumps({"userId": user_id, "tag": tag, "content": content}).encode()
-    req = urllib.request.Request(
+    payload = json_dumps({"userId": user_id, "tag": tag, "content": content})
+    client = await get_client()
+    resp = await client.post(
         API_BASE,
-        data=payload,
+        content=payload,
         headers=service_headers({"Content-Type": "application/json"}),
-        method="POST",
     )
-    with urllib.request.urlopen(req, timeout=10) as resp:
-        return json.loads(resp.read())
+    resp.raise_for_status()
+    return json_loads(resp.content)
 
 
 async def append_memory(input_data: dict) -> str:
@@ -122,17 +124,17 @@ async def append_memory(input_data: dict) -> str:
         return "Error: tag and content are required"
 
     try:
-        existing = _fetch_memory(user_id, tag)
+        existing = await _fetch_memory(user_id, tag)
 
         if existing:
             new_content = existing["content"] + separator + content
-            _save_memory(user_id, tag, new_content)
+            await _save_memory(user_id, tag, new_content)
             return f"Memory '{tag}' appended successfully."
         else:
-            _save_memory(user_id, tag, content)
+            await _save_memory(user_id, tag, content)
             return f"Memory '{tag}' created successfully."
-    except urllib.error.HTTPError as e:
-        body = e.read().decode()
+    except httpx.HTTPStatusError as e:
+        body = e.response.text
         return f"Error appending memory: {body}"
     except Exception as e:
         return f"Error appending memory: {str(e)}"
@@ -149,7 +151,7 @@ async def edit_memory(input_data: dict) -> str:
         return "Error: tag and old_text are required"
 
     try:
-        existing = _fetch_memory(user_id, tag)
+        existing = await _fetch_memory(user_id, tag)
 
         if not existing:
             return f"No memory found with tag '{tag}'"
@@ -159,10 +161,10 @@ async def edit_memory(input_data: dict) -> str:
             return f"Text '{old_text}' not found in memory '{tag}'"
 
         new_content = old_content.replace(old_text, new_text)
-        _save_memory(user_id, tag, new_content)
+        await _save_memory(user_id, tag, new_content)
         return f"Memory '{tag}' edited successfully."
-    except urllib.error.HTTPError as e:
-        body = e.read().decode()
+    except httpx.HTTPStatusError as e:
+        body = e.response.text
         return f"Error editing memory: {body}"
     except Exception as e:
         return f"Error editing memory: {str(e)}"
@@ -173,18 +175,16 @@ async def list_memory_tags(input_data: dict) -> str:
     user_id = input_data.get("userId", "")
 
     try:
-        params = urllib.parse.urlencode({"userId": user_id})
-        url = f"{API_BASE}?{params}"
-        list_req = urllib.request.Request(url, headers=service_headers())
-
-        with urllib.request.urlopen(list_req, timeout=10) as resp:
-            result = json.loads(resp.read())
-            memories = result.get("memories", [])
-            tags = [m["tag"] for m in memories]
-
-            if not tags:
-                return "No memories saved yet."
-            return "Memory tags: " + ", ".join(tags)
+        client = await get_client()
+        resp = await client.get(API_BASE, params={"userId": user_id}, headers=service_headers())
+        resp.raise_for_status()
+        result = json_loads(resp.content)
+        memories = result.get("memories", [])
+        tags = [m["tag"] for m in memories]
+
+        if not tags:
+            return "No memories saved yet."
+        return "Memory tags: " + ", ".join(tags)
     except Exception as e:
         return f"Error listing memory tags: {str(e)}"
 
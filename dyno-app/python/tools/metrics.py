@@ -8,16 +8,14 @@ In cloud mode, all operations use the Supabase database regardless of
 STORAGE_MODE — the metrics table is always available in Supabase.
 """
 
-import json
 import os
 import time
-import urllib.request
 import urllib.parse
-import urllib.error
 from pathlib import Path
 from typing import Optional
 
-from ._common import DATA_DIR, STORAGE_MODE
+from ._common import DATA_DIR, STORAGE_MODE, JSONDecodeError, json_dumps, json_dumps_pretty, json_loads
+from ._http import get_client
 
 # ── Local storage helpers ──────────────────────────────────────────────────
 
@@ -50,14 +48,11 @@ def _headers(*, prefer: str | None = None) -> dict[str, str]:
     return h
 
 
-def _do_request(url: str, method: str = "GET", data: bytes | None = None,
-                headers: dict | None = None) -> tuple[int, str]:
-    req = urllib.request.Request(url, data=data, headers=headers or {}, method=method)
-    try:
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            return resp.status, resp.read().decode("utf-8")
-    except urllib.error.HTTPError as e:
-        return e.code, e.read().decode("utf-8")
+async def _do_request(url: str, method: str = "GET", data: bytes | None = None,
+                      headers: dict | None = None) -> tuple[int, str]:
+    client = await get_client()
+    resp = await client.request(method, url, content=data, headers=headers or {}, timeout=15)
+    return resp.status_code, resp.text
 
 
 # ── Local JSONL helpers ────────────────────────────────────────────────────
@@ -68,8 +63,8 @@ def _get_metric_file(user_id: str, metric_name: str) -> Path:
 
 
 def _append_entry(filepath: Path, entry: dict) -> None:
-    with filepath.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(entry) + "\n")
+    with filepath.open("ab") as f:
+        f.write(json_dumps(entry) + b"\n")
 
 
 def _read_entries(filepath: Path, limit: Optional[int] = None, since: Optional[float] = None) -> list[dict]:
@@ -82,11 +77,11 @@ def _read_entries(filepath: Path, limit: Optional[int] = None, since: Optional[f
             if not line:
                 continue
             try:
-                entry = json.loads(line)
+                entry = json_loads(line)
                 if since and entry.get("timestamp", 0) < since:
                     continue
                 entries.append(entry)
-            except json.JSONDecodeError:
+            except JSONDecodeError:
                 continue
     entries.reverse()
     if limit:
@@ -104,15 +99,15 @@ async def handle_track_metric(input_data: dict) -> str:
     metadata = input_data.get("metadata", {})
 
     if not user_id:
-        return json.dumps({"success": False, "error": "userId is required"})
+        return json_dumps({"success": False, "error": "userId is required"}).decode()
     if not metric_name:
-        return json.dumps({"success": False, "error": "metric_name is required"})
+        return json_dumps({"success": False, "error": "metric_name is required"}).decode()
     if value is None:
-        return json.dumps({"success": False, "error": "value is required"})
+        return json_dumps({"success": False, "error": "value is required"}).decode()
     try:
         value = float(value)
     except (ValueError, TypeError):
-        return json.dumps({"success": False, "error": "value must be numeric"})
+        return json_dumps({"success": False, "error": "value must be numeric"}).decode()
 
     if _use_cloud():
         # Insert into Supabase agent_metrics table
@@ -125,32 +120,32 @@ async def handle_track_metric(input_data: dict) -> str:
             "timestamp": ts,
             "metadata": metadata,
         }
-        payload = json.dumps([row]).encode()
-        status, body = _do_request(
+        payload = json_dumps([row])
+        status, body = await _do_request(
             _rest_url(), "POST", data=payload,
             headers=_headers(prefer="return=representation")
         )
         if status >= 400:
-            return json.dumps({"success": False, "error": f"DB error ({status}): {body}"})
-        return json.dumps({
+            return json_dumps({"success": False, "error": f"DB error ({status}): {body}"}).decode()
+        return json_dumps({
             "success": True,
             "metric_name": metric_name,
             "value": value,
             "timestamp": timestamp,
             "storage": "cloud",
-        })
+        }).decode()
 
     # Local mode: JSONL
     entry = {"timestamp": timestamp, "value": value, "metadata": metadata}
     filepath = _get_metric_file(user_id, metric_name)
     _append_entry(filepath, entry)
-    return json.dumps({
+    return json_dumps({
         "success": True,
         "metric_name": metric_name,
         "value": value,
         "timestamp": timestamp,
         "file": filepath.name,
-    })
+    }).decode()
 
 
 async def handle_get_metrics(input_data: dict) -> str:
@@ -160,9 +155,9 @@ async def handle_get_metrics(input_data: dict) -> str:
     since = input_data.get("since")
 
     if not user_id:
-        return json.dumps({"success": False, "error": "userId is required"})
+        return json_dumps({"success": False, "error": "userId is required"}).decode()
     if not metric_name:
-        return json.dumps({"success": False, "error": "metric_name is required"})
+        return json_dumps({"success": False, "error": "metric_name is required"}).decode()
 
     if _use_cloud():
         # Query from Supabase
@@ -179,11 +174,11 @@ async def handle_get_metrics(input_data: dict) -> str:
 
         qs = urllib.parse.urlencode(params)
         url = f"{_rest_url()}?{qs}"
-        status, body = _do_request(url, "GET", headers=_headers())
+        status, body = await _do_request(url, "GET", headers=_headers())
         if status >= 400:
-            return json.dumps({"success": False, "error": f"DB error ({status}): {body}"})
+            return json_dumps({"success": False, "error": f"DB error ({status}): {body}"}).decode()
 
-        rows = json.loads(body)
+        rows = json_loads(body)
         entries = [
             {"timestamp": r.get("timestamp"), "value": float(r["value"]), "metadata": r.get("metadata", {})}
             for r in rows
@@ -201,12 +196,12 @@ async def handle_get_metrics(input_data: dict) -> str:
         else:
             stats = None
 
-        return json.dumps({
+        return json_dumps_pretty({
             "success": True,
             "metric_name": metric_name,
             "entries": entries,
             "stats": stats,
-        }, indent=2)
+        }).decode()
 
     # Local mode: JSONL
     filepath = _get_metric_file(user_id, metric_name)
@@ -224,18 +219,18 @@ async def handle_get_metrics(input_data: dict) -> str:
     else:
         stats = None
 
-    return json.dumps({
+    return json_dumps_pretty({
         "success": True,
         "metric_name": metric_name,
         "entries": entries,
         "stats": stats,
-    }, indent=2)
+    }).decode()
 
 
 async def handle_list_metrics(input_data: dict) -> str:
     user_id = input_data.get("userId", "").strip()
     if not user_id:
-        return json.dumps({"success": False, "error": "userId is required"})
+        return json_dumps({"success": False, "error": "userId is required"}).decode()
 
     if _use_cloud():
         # Get distinct metric names with latest value and count
@@ -248,11 +243,11 @@ async def handle_list_metrics(input_data: dict) -> str:
         }
         qs = urllib.parse.urlencode(params)
         url = f"{_rest_url()}?{qs}"
-        status, body = _do_request(url, "GET", headers=_headers())
+        status, body = await _do_request(url, "GET", headers=_headers())
         if status >= 400:
-            return json.dumps({"success": False, "error": f"DB error ({status}): {body}"})
+            return json_dumps({"success": False, "error": f"DB error ({status}): {body}"}).decode()
 
-        rows = json.loads(body)
+        rows = json_loads(body)
         # Group by metric_name
         metrics_map: dict[str, dict] = {}
         for r in rows:
@@ -265,10 +260,10 @@ async def handle_list_metrics(input_data: dict) -> str:
                 }
             metrics_map[name]["count"] += 1
 
-        return json.dumps({
+        return json_dumps_pretty({
             "success": True,
             "metrics": list(metrics_map.values()),
-        }, indent=2)
+        }).decode()
 
     # Local mode: JSONL
     pattern = f"{user_id}_*.jsonl"
@@ -287,10 +282,10 @@ async def handle_list_metrics(input_data: dict) -> str:
             "file": filepath.name,
         })
 
-    return json.dumps({
+    return json_dumps_pretty({
         "success": True,
         "metrics": metrics,
-    }, indent=2)
+    }).decode()
 
 
 async def handle_delete_metric(input_data: dict) -> str:
@@ -298,9 +293,9 @@ async def handle_delete_metric(input_data: dict) -> str:
     metric_name = input_data.get("metric_name", "").strip()
 
     if not user_id:
-        return json.dumps({"success": False, "error": "userId is required"})
+        return json_dumps({"success": False, "error": "userId is required"}).decode()
     if not metric_name:
-        return json.dumps({"success": False, "error": "metric_name is required"})
+        return json_dumps({"success": False, "error": "metric_name is required"}).decode()
 
     if _use_cloud():
         # Delete all entries for this metric from Supabase
@@ -310,31 +305,31 @@ async def handle_delete_metric(input_data: dict) -> str:
         }
         qs = urllib.parse.urlencode(params)
         url = f"{_rest_url()}?{qs}"
-        status, body = _do_request(url, "DELETE", headers=_headers(prefer="return=representation"))
+        status, body = await _do_request(url, "DELETE", headers=_headers(prefer="return=representation"))
         if status >= 400:
-            return json.dumps({"success": False, "error": f"DB error ({status}): {body}"})
+            return json_dumps({"success": False, "error": f"DB error ({status}): {body}"}).decode()
 
-        deleted = json.loads(body)
-        return json.dumps({
+        deleted = json_loads(body)
+        return json_dumps({
             "success": True,
             "metric_name": metric_name,
             "deleted": True,
             "count": len(deleted),
-        })
+        }).decode()
 
     # Local mode: JSONL
     filepath = _get_metric_file(user_id, metric_name)
     if not filepath.exists():
-        return json.dumps({
+        return json_dumps({
             "success": False,
             "error": f"Metric '{metric_name}' not found",
-        })
+        }).decode()
     filepath.unlink()
-    return json.dumps({
+    return json_dumps({
         "success": True,
         "metric_name": metric_name,
         "deleted": True,
-    })
+    }).decode()
 
 
 # ── Tool definitions ────────────────────────────────────────────────────────
@@ -5,15 +5,13 @@ to Supabase Storage through the Next.js API. The local file is deleted after
 upload. All listing and reading goes through the Supabase-backed API.
 """
 
-import json
 import os
 import re
 import tempfile
 import time
-import urllib.request
-import urllib.error
 
-from ._common import FRONTEND_URL, service_headers
+from ._common import FRONTEND_URL, json_loads, service_headers
+from ._http import get_client
 from .memories import _get_user_id
 
 API_BASE = FRONTEND_URL + "/api/screenshots"
@@ -102,7 +100,7 @@ async def handle_take_screenshot(input_data: dict) -> str:
             await browser.close()
 
         size = os.path.getsize(tmppath)
-        public_url = _upload_to_api(tmppath, filename, user_id)
+        public_url = await _upload_to_api(tmppath, filename, user_id)
         return f"Screenshot saved: {filename} ({size} bytes)\nPublic URL: {public_url}"
     except Exception as e:
         return f"Error taking screenshot: {str(e)}"
@@ -113,7 +111,7 @@ async def handle_take_screenshot(input_data: dict) -> str:
             pass
 
 
-def _upload_to_api(filepath: str, filename: str, user_id: str) -> str:
+async def _upload_to_api(filepath: str, filename: str, user_id: str) -> str:
     """Upload a screenshot file to the Next.js API endpoint using multipart form data."""
     import io
 
@@ -143,17 +141,17 @@ def _upload_to_api(filepath: str, filename: str, user_id: str) -> str:
     body.write(f"--{boundary}--\r\n".encode())
 
     data = body.getvalue()
-    req = urllib.request.Request(
+    client = await get_client()
+    resp = await client.post(
         API_BASE,
-        data=data,
-        method="POST",
+        content=data,
         headers=service_headers({
             "Content-Type": f"multipart/form-data; boundary={boundary}",
-            "Content-Length": str(len(data)),
         }),
+        timeout=30,
     )
-    with urllib.request.urlopen(req, timeout=30) as resp:
-        result = json.loads(resp.read().decode())
+    resp.raise_for_status()
+    result = json_loads(resp.content)
     return result.get("publicUrl", "")
 
 
@@ -163,11 +161,10 @@ async def handle_list_screenshots(input_data: dict) -> str:
         return "Error: userId is required to list screenshots"
 
     try:
-        import urllib.parse
-        url = f"{API_BASE}?userId={urllib.parse.quote(user_id)}"
-        req = urllib.request.Request(url, headers=service_headers())
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read().decode())
+        client = await get_client()
+        resp = await client.get(API_BASE, params={"userId": user_id}, headers=service_headers())
+        resp.raise_for_status()
+        data = json_loads(resp.content)
         screenshots = data.get("screenshots", [])
         if not screenshots:
             return "No screenshots found."
@@ -186,11 +183,10 @@ async def handle_read_screenshot(input_data: dict) -> str:
 
     filename = input_data["filename"]
     try:
-        import urllib.parse
-        url = f"{API_BASE}?userId={urllib.parse.quote(user_id)}"
-        req = urllib.request.Request(url, headers=service_headers())
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read().decode())
+        client = await get_client()
+        resp = await client.get(API_BASE, params={"userId": user_id}, headers=service_headers())
+        resp.raise_for_status()
+        data = json_loads(resp.content)
         screenshots = data.get("screenshots", [])
         for s in screenshots:
             if s["filename"] == filename:
@@ -3,11 +3,12 @@
 Provides file operations against Supabase Storage buckets with user-scoped
 paths: all files are stored under {userId}/{path} for isolation.
 
-Uses urllib like supabase_client.py — zero external dependencies.
+Uses urllib — zero external dependencies.
 """
 
 import json
 import os
+import ssl
 import urllib.request
 import urllib.parse
 import urllib.error
@@ -15,6 +16,11 @@ import urllib.error
 _SUPABASE_URL = os.getenv("NEXT_PUBLIC_SUPABASE_URL", "")
 _SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
 
+# One TLS context for every request — plain urlopen() builds a fresh
+# SSLContext (and re-parses the CA bundle) for each HTTPS connection.
+_SSL_CONTEXT = ssl.create_default_context()
+_opener = urllib.request.build_opener(urllib.request.HTTPSHandler(context=_SSL_CONTEXT))
+
 
 def _storage_url(bucket: str, path: str = "") -> str:
     """Build the Supabase Storage API URL."""
@@ -49,7 +55,7 @@ def upload_file(bucket: str, user_id: str, path: str, content_bytes: bytes,
 
     req = urllib.request.Request(url, data=content_bytes, headers=headers, method="POST")
     try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
+        with _opener.open(req, timeout=30) as resp:
             return json.loads(resp.read().decode("utf-8"))
     except urllib.error.HTTPError as e:
         body = e.read().decode("utf-8")
@@ -68,7 +74,7 @@ def read_file(bucket: str, user_id: str, path: str) -> bytes:
 
     req = urllib.request.Request(url, headers=_headers(), method="GET")
     try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
+        with _opener.open(req, timeout=30) as resp:
             return resp.read()
     except urllib.error.HTTPError as e:
         body = e.read().decode("utf-8")
@@ -99,7 +105,7 @@ def list_files(bucket: str, user_id: str, prefix: str = "") -> list[dict]:
     headers = _headers(content_type="application/json")
     req = urllib.request.Request(list_url, data=payload, headers=headers, method="POST")
     try:
-        with urllib.request.urlopen(req, timeout=15) as resp:
+        with _opener.open(req, timeout=15) as resp:
             data = json.loads(resp.read().decode("utf-8"))
             # Supabase returns a list directly, but guard against
             # unexpected wrapper objects.
@@ -128,7 +134,7 @@ def delete_file(bucket: str, user_id: str, path: str) -> dict:
 
     req = urllib.request.Request(delete_url, data=payload, headers=headers, method="DELETE")
     try:
-        with urllib.request.urlopen(req, timeout=15) as resp:
+        with _opener.open(req, timeout=15) as resp:
             return json.loads(resp.read().decode("utf-8"))
     except urllib.error.HTTPError as e:
         body = e.read().decode("utf-8")
@@ -1,16 +1,19 @@
 """Direct Supabase database tools via PostgREST REST API.
 
 Gives the agent direct CRUD access to all user data tables without
-going through the Next.js API layer. Uses urllib (no pip dependency).
+going through the Next.js API layer. Requests go through the shared
+httpx client in _http.py so connections to PostgREST are reused.
 
 Tables: profiles, agent_memories, agent_screenshots, token_usage, widget_layouts
 """
 
-import json
 import os
-import urllib.request
 import urllib.parse
-import urllib.error
+
+import httpx
+
+from ._common import JSONDecodeError, json_dumps, json_loads
+from ._http import get_client
 
 # Load Supabase credentials from environment variables
 _SUPABASE_URL = os.getenv("NEXT_PUBLIC_SUPABASE_URL", "")
@@ -79,15 +82,32 @@ def _build_query_string(filters: dict[str, str] | None, select: str | None,
     return urllib.parse.urlencode(params) if params else ""
 
 
-def _do_request(url: str, method: str = "GET", data: bytes | None = None,
-                headers: dict | None = None) -> tuple[int, str]:
+async def _do_request(url: str, method: str = "GET", data: bytes | None = None,
+                      headers: dict | None = None) -> tuple[int, str]:
     """Make an HTTP request and return (status_code, body)."""
-    req = urllib.request.Request(url, data=data, headers=headers or {}, method=method)
-    try:
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            return resp.status, resp.read().decode("utf-8")
-    except urllib.error.HTTPError as e:
-        return e.code, e.read().decode("utf-8")
+    status, body, _ = await _do_request_with_headers(url, method, data, headers)
+    return status, body
+
+
+async def _do_request_with_headers(url: str, method: str = "GET", data: bytes | None = None,
+                                   headers: dict | None = None) -> tuple[int, str, httpx.Headers]:
+    """Like _do_request, but also return the response headers."""
+    client = await get_client()
+    resp = await client.request(method, url, content=data, headers=headers or {}, timeout=15)
+    return resp.status_code, resp.text, resp.headers
+
+
+def _range_count(content_range: str | None) -> int | None:
+    """Row count from a PostgREST Content-Range header ("0-24/*", "*/0", ...)."""
+    if not content_range:
+        return None
+    rows, _, _ = content_range.partition("/")
+    if rows == "*":
+        return 0
+    start, sep, end = rows.partition("-")
+    if not sep or not start.isdigit() or not end.isdigit():
+        return None
+    return int(end) - int(start) + 1
 
 
 # ── Tool definitions ──────────────────────────────────────────────────────────
@@ -225,14 +245,21 @@ async def handle_db_query(input_data: dict) -> str:
     qs = _build_query_string(filters, select, order, limit)
     url = _rest_url(table) + ("?" + qs if qs else "")
 
-    status, body = _do_request(url, "GET", headers=_headers())
+    status, body, resp_headers = await _do_request_with_headers(url, "GET", headers=_headers())
     if status >= 400:
         return f"Error ({status}): {body}"
 
+    # PostgREST reports the returned row range in Content-Range, so the
+    # already-encoded array can be passed through without a parse/re-dump.
+    count = _range_count(resp_headers.get("Content-Range"))
+    if count is not None and body.lstrip().startswith("["):
+        # Same compact separators as the json_dumps path below
+        return '{"rows":' + body + ',"count":' + str(count) + '}'
+
     try:
-        rows = json.loads(body)
-        return json.dumps({"rows": rows, "count": len(rows)})
-    except json.JSONDecodeError:
+        rows = json_loads(body)
+        return json_dumps({"rows": rows, "count": len(rows)}).decode()
+    except JSONDecodeError:
         return body
 
 
@@ -258,17 +285,17 @@ async def handle_db_insert(input_data: dict) -> str:
     if user_id and col:
         rows = [{**row, col: user_id} for row in rows]
 
-    data = json.dumps(rows).encode()
+    data = json_dumps(rows)
     url = _rest_url(table)
-    status, body = _do_request(url, "POST", data=data,
-                                headers=_headers(prefer="return=representation"))
+    status, body = await _do_request(url, "POST", data=data,
+                                      headers=_headers(prefer="return=representation"))
     if status >= 400:
         return f"Error ({status}): {body}"
 
     try:
-        inserted = json.loads(body)
-        return json.dumps({"inserted": len(inserted), "rows": inserted})
-    except json.JSONDecodeError:
+        inserted = json_loads(body)
+        return json_dumps({"inserted": len(inserted), "rows": inserted}).decode()
+    except JSONDecodeError:
         return f"Inserted (status {status})"
 
 
@@ -297,17 +324,17 @@ async def handle_db_update(input_data: dict) -> str:
 
     qs = _build_query_string(filters, None, None, None)
     url = _rest_url(table) + ("?" + qs if qs else "")
-    payload = json.dumps(update_data).encode()
+    payload = json_dumps(update_data)
 
-    status, body = _do_request(url, "PATCH", data=payload,
-                                headers=_headers(prefer="return=representation"))
+    status, body = await _do_request(url, "PATCH", data=payload,
+                                      headers=_headers(prefer="return=representation"))
     if status >= 400:
         return f"Error ({status}): {body}"
 
     try:
-        updated = json.loads(body)
-        return json.dumps({"updated": len(updated), "rows": updated})
-    except json.JSONDecodeError:
+        updated = json_loads(body)
+        return json_dumps({"updated": len(updated), "rows": updated}).decode()
+    except JSONDecodeError:
         return f"Updated (status {status})"
 
 
@@ -333,14 +360,14 @@ async def handle_db_delete(input_data: dict) -> str:
     qs = _build_query_string(filters, None, None, None)
     url = _rest_url(table) + ("?" + qs if qs else "")
 
-    status, body = _do_request(url, "DELETE", headers=_headers(prefer="return=representation"))
+    status, body = await _do_request(url, "DELETE", headers=_headers(prefer="return=representation"))
     if status >= 400:
         return f"Error ({status}): {body}"
 
     try:
-        deleted = json.loads(body)
-        return json.dumps({"deleted": len(deleted), "rows": deleted})
-    except json.JSONDecodeError:
+        deleted = json_loads(body)
+        return json_dumps({"deleted": len(deleted), "rows": deleted}).decode()
+    except JSONDecodeError:
         return f"Deleted (status {status})"
 
 
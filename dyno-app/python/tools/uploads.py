@@ -4,14 +4,11 @@ Dual-mode: reads from local filesystem or Supabase Storage
 depending on STORAGE_MODE setting.
 """
 
-import json
 import os
 import time
-import urllib.request
-import urllib.parse
-import urllib.error
 
-from ._common import UPLOADS_DIR, UPLOADS_BUCKET, STORAGE_MODE, FRONTEND_URL, safe_path, service_headers
+from ._http import get_client
+from ._common import UPLOADS_DIR, UPLOADS_BUCKET, STORAGE_MODE, FRONTEND_URL, json_loads, safe_path, service_headers
 
 TOOL_DEFS = [
     {
@@ -101,21 +98,22 @@ async def handle_list_uploads(input_data: dict) -> str:
         return "Error: userId is required"
 
     try:
-        url = f"{FRONTEND_URL}/api/uploads?userId={urllib.parse.quote(user_id)}"
-        list_req = urllib.request.Request(url, headers=service_headers())
-        with urllib.request.urlopen(list_req, timeout=10) as resp:
-            files = json.loads(resp.read())
+        client = await get_client()
+        resp = await client.get(
+            f"{FRONTEND_URL}/api/uploads",
+            params={"userId": user_id},
+            headers=service_headers(),
+        )
+        resp.raise_for_status()
+        files = json_loads(resp.content)
 
         if not files:
             return "No files in the Document Vault. The user can upload files at /vault."
 
-        lines = []
-        for f in files:
-            name = f.get("filename", "?")
-            size = _format_size(f.get("size", 0))
-            lines.append(f"  {name} ({size})")
-
-        return f"{len(files)} file(s) in Vault:\n" + "\n".join(lines)
+        return "\n".join([
+            f"{len(files)} file(s) in Vault:",
+            *(f"  {f.get('filename', '?')} ({_format_size(f.get('size', 0))})" for f in files),
+        ])
     except Exception as e:
         return f"Error listing uploads: {str(e)}"
 
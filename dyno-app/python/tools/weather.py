@@ -1,9 +1,9 @@
 """Weather tool: get_weather using Open-Meteo API."""
 
-import json
-import urllib.request
-import urllib.parse
-import urllib.error
+import httpx
+
+from ._common import json_loads
+from ._http import get_client
 
 TOOL_DEFS = [
     {
@@ -28,12 +28,14 @@ READ_ONLY = {"get_weather"}
 async def _geocode_location(location: str) -> tuple[float, float, str] | None:
     """Convert location name to coordinates using Open-Meteo geocoding API."""
     try:
-        params = urllib.parse.urlencode({"name": location, "count": 1, "language": "en", "format": "json"})
-        url = f"https://geocoding-api.open-meteo.com/v1/search?{params}"
-        
-        req = urllib.request.Request(url, headers={"User-Agent": "Marty-Agent/1.0"})
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
+        client = await get_client()
+        resp = await client.get(
+            "https://geocoding-api.open-meteo.com/v1/search",
+            params={"name": location, "count": 1, "language": "en", "format": "json"},
+            headers={"User-Agent": "Marty-Agent/1.0"},
+        )
+        resp.raise_for_status()
+        data = json_loads(resp.content)
         
         if "results" in data and len(data["results"]) > 0:
             result = data["results"][0]
@@ -61,19 +63,21 @@ async def handle_get_weather(input_data: dict) -> str:
     
     try:
         # Fetch weather data from Open-Meteo API
-        params = urllib.parse.urlencode({
-            "latitude": lat,
-            "longitude": lon,
-            "current": "temperature_2m,relative_humidity_2m,apparent_temperature,precipitation,weather_code,wind_speed_10m",
-            "temperature_unit": "fahrenheit",
-            "wind_speed_unit": "mph",
-            "precipitation_unit": "inch"
-        })
-        url = f"https://api.open-meteo.com/v1/forecast?{params}"
-        
-        req = urllib.request.Request(url, headers={"User-Agent": "Marty-Agent/1.0"})
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
+        client = await get_client()
+        resp = await client.get(
+            "https://api.open-meteo.com/v1/forecast",
+            params={
+                "latitude": lat,
+                "longitude": lon,
+                "current": "temperature_2m,relative_humidity_2m,apparent_temperature,precipitation,weather_code,wind_speed_10m",
+                "temperature_unit": "fahrenheit",
+                "wind_speed_unit": "mph",
+                "precipitation_unit": "inch"
+            },
+            headers={"User-Agent": "Marty-Agent/1.0"},
+        )
+        resp.raise_for_status()
+        data = json_loads(resp.content)
         
         current = data.get("current", {})
         
@@ -99,16 +103,16 @@ async def handle_get_weather(input_data: dict) -> str:
         weather_code = current.get("weather_code")
         conditions = weather_codes.get(weather_code, "Unknown")
         
-        result = f"Weather for {full_name}:\n"
-        result += f"Conditions: {conditions}\n"
-        result += f"Temperature: {temp}°F (feels like {feels_like}°F)\n"
-        result += f"Humidity: {humidity}%\n"
-        result += f"Wind Speed: {wind_speed} mph\n"
-        result += f"Precipitation: {precipitation} in"
-        
-        return result
+        return (
+            f"Weather for {full_name}:\n"
+            f"Conditions: {conditions}\n"
+            f"Temperature: {temp}°F (feels like {feels_like}°F)\n"
+            f"Humidity: {humidity}%\n"
+            f"Wind Speed: {wind_speed} mph\n"
+            f"Precipitation: {precipitation} in"
+        )
         
-    except urllib.error.URLError as e:
+    except httpx.HTTPError as e:
         return f"Error fetching weather data: {str(e)}"
     except Exception as e:
         return f"Error: {str(e)}"
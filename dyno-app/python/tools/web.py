@@ -1,10 +1,12 @@
 """Web fetching tool: fetch_url."""
 
 import re
-import urllib.request
-import urllib.error
 from html.parser import HTMLParser
 
+import httpx
+
+from ._http import get_client
+
 TOOL_DEFS = [
     {
         "name": "fetch_url",
@@ -59,10 +61,16 @@ def strip_html(html: str) -> str:
 async def handle_fetch_url(input_data: dict) -> str:
     url = input_data["url"]
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": "Marty-Agent/1.0"})
-        with urllib.request.urlopen(req, timeout=10) as resp:
+        client = await get_client()
+        async with client.stream("GET", url, headers={"User-Agent": "Marty-Agent/1.0"}) as resp:
+            resp.raise_for_status()
             content_type = resp.headers.get("Content-Type", "")
-            raw = resp.read(512_000).decode("utf-8", errors="replace")
+            buf = bytearray()
+            async for chunk in resp.aiter_bytes():
+                buf += chunk
+                if len(buf) >= 512_000:
+                    break
+            raw = buf[:512_000].decode("utf-8", errors="replace")
 
         if "html" in content_type.lower() or raw.strip().startswith("<"):
             text = strip_html(raw)
@@ -74,7 +82,7 @@ async def handle_fetch_url(input_data: dict) -> str:
         if len(text) > 10000:
             return text[:10000] + f"\n\n... (truncated, {len(text)} total chars)"
         return text
-    except urllib.error.URLError as e:
+    except httpx.HTTPError as e:
         return f"Error fetching URL: {str(e)}"
     except Exception as e:
         return f"Error: {str(e)}"
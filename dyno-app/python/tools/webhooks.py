@@ -4,66 +4,251 @@ Webhooks let external services push data to the agent (OAuth callbacks,
 GitHub push events, form submissions, scheduled pings, etc.).
 """
 
-import json
+import asyncio
+import base64
+import functools
+import hashlib
+import hmac
+import io
 import os
-import secrets
-import urllib.request
-import urllib.parse
-import urllib.error
+import re
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Final
+from urllib.parse import quote
 
-from ._common import FRONTEND_URL, service_headers
+import httpx
+
+from ._common import FRONTEND_URL, json_dumps, json_dumps_pretty, json_loads, service_headers
+from ._http import get_client
 
 API_BASE = FRONTEND_URL + "/api/webhooks"
+# Parsed once — httpx reuses a URL instance as-is instead of re-parsing a str
+API_URL = httpx.URL(API_BASE)
+
+# Same rule the /api/webhooks route enforces — reject locally to skip a
+# round trip that can only fail.
+_ENDPOINT_NAME_RE = re.compile(r"[A-Za-z0-9_-]+")
+_ENDPOINT_NAME_ERROR = "Error: endpoint_name must contain only alphanumeric characters, hyphens, and underscores"
+
+
+# ── GET URL builders ─────────────────────────────────────────────────────────
+# The query shape is fixed per action, so URLs are a precomputed prefix plus
+# quoted values rather than a generic urlencode pass. The same user issues
+# many calls per conversation, so quoted values — and the list/config URLs,
+# which depend on nothing else — are memoized as already-parsed httpx.URLs.
+
+_USER_PREFIX = API_BASE + "?userId="
+
+
+@functools.lru_cache(maxsize=256)
+def _q(value: str) -> str:
+    return quote(value, safe="")
+
+
+@functools.lru_cache(maxsize=256)
+def _list_url(user_id: str) -> httpx.URL:
+    return httpx.URL(_USER_PREFIX + _q(user_id) + "&action=list")
+
 
-_current_user_id: str | None = None
+@functools.lru_cache(maxsize=256)
+def _config_url(user_id: str) -> httpx.URL:
+    return httpx.URL(_USER_PREFIX + _q(user_id) + "&action=config")
+
+
+def _poll_url(user_id: str, endpoint_name: str | None) -> str:
+    url = _USER_PREFIX + _q(user_id) + "&action=poll"
+    if endpoint_name:
+        url += "&endpointName=" + _q(endpoint_name)
+    return url
+
+
+def _delete_url(user_id: str, endpoint_name: str) -> str:
+    return _USER_PREFIX + _q(user_id) + "&endpointName=" + _q(endpoint_name)
+
+
+# Per-task user context — concurrent tool calls for different users each see
+# their own value instead of racing on a module global.
+_current_user_id: ContextVar[str | None] = ContextVar("webhook_user_id", default=None)
 
 
 def set_user_id(user_id: str):
     """Called by the server to set the user context for webhook operations."""
-    global _current_user_id
-    _current_user_id = user_id
+    _current_user_id.set(user_id)
 
 
 def _get_user_id(input_data: dict | None = None) -> str:
     if input_data and input_data.get("userId"):
         return input_data["userId"]
-    return _current_user_id or ""
+    return _current_user_id.get() or ""
+
+
+# ── Read cache ───────────────────────────────────────────────────────────────
+# list_webhooks / get_webhook_config are re-invoked often within a single
+# conversation, so successful responses are kept per user for a short TTL.
+# Mutating handlers invalidate exactly the entries their write affected, once
+# the write has succeeded. WEBHOOK_CACHE_TTL=0 disables caching.
+
+_CACHE_TTL = float(os.getenv("WEBHOOK_CACHE_TTL", "30"))
+_CACHE_MAX_ENTRIES = 1024
+
+# (kind, user_id) -> (fetched_at, http_status, formatted response, etag);
+# kind is "list" or "config". fetched_at is when the upstream request was
+# issued. An invalidated key keeps a tombstone with a None response, so a read
+# that was already in flight before the write can't repopulate the entry with
+# pre-write data. Expired entries that carry an ETag are kept so the next
+# fetch can revalidate them with If-None-Match instead of re-downloading.
+_read_cache: dict[tuple[str, str], tuple[float, int, str | None, str | None]] = {}
+
+
+def _cache_get(key: tuple[str, str]) -> str | None:
+    entry = _read_cache.get(key)
+    if entry is None:
+        return None
+    fetched_at, _status, value, etag = entry
+    if time.monotonic() - fetched_at >= _CACHE_TTL:
+        if etag is None:
+            _read_cache.pop(key, None)
+        return None
+    return value
+
+
+def _cache_etag(key: tuple[str, str]) -> tuple[str, str] | None:
+    """Return (etag, formatted response) of a cached entry, fresh or not."""
+    entry = _read_cache.get(key)
+    if entry is None or entry[2] is None or entry[3] is None:
+        return None
+    return entry[3], entry[2]
+
+
+def _cache_put(
+    key: tuple[str, str], value: str, fetched_at: float, status: int, etag: str | None = None,
+) -> None:
+    if _CACHE_TTL <= 0:
+        return
+    current = _read_cache.get(key)
+    if current is not None and current[0] > fetched_at:
+        return  # a newer response or invalidation already landed
+    _cache_store(key, (fetched_at, status, value, etag))
+
+
+def _cache_store(key: tuple[str, str], entry: tuple[float, int, str | None, str | None]) -> None:
+    # Re-insert so dict order tracks recency, then evict the oldest entry
+    _read_cache.pop(key, None)
+    if len(_read_cache) >= _CACHE_MAX_ENTRIES:
+        _read_cache.pop(next(iter(_read_cache)))
+    _read_cache[key] = entry
+
+
+def _invalidate(user_id: str, kinds: tuple[str, ...]) -> None:
+    """Drop the cached reads of `kinds` for a user after a successful write."""
+    for kind in kinds:
+        # A fetch already in flight may have been issued before the write;
+        # later readers must start their own rather than join it.
+        _inflight.pop((kind, user_id), None)
+    if _CACHE_TTL <= 0:
+        return
+    now = time.monotonic()
+    for kind in kinds:
+        _cache_store((kind, user_id), (now, 0, None, None))
+
+
+# ── Request coalescing ───────────────────────────────────────────────────────
+# Parallel tool calls often ask for the same read twice; concurrent callers
+# with the same key await one shared in-flight request instead of each
+# issuing their own.
+
+_inflight: dict[tuple[str, ...], asyncio.Task] = {}
+
+
+async def _singleflight(key: tuple[str, ...], fetch: Callable[[], Awaitable[str]]) -> str:
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _inflight[key] = task
+        # Only clear the slot if it's still ours — _invalidate may have
+        # detached this task and a newer fetch taken its place
+        task.add_done_callback(lambda t: _inflight.get(key) is t and _inflight.pop(key))
+    # Shield so one cancelled caller doesn't cancel the request for the others
+    return await asyncio.shield(task)
+
+
+# ── Secret generation ────────────────────────────────────────────────────────
+# Webhook secrets are 32 random bytes, encoded base64url without padding (the
+# same format as secrets.token_urlsafe(32)). Rather than one getrandom()
+# syscall per registration, draw entropy for a batch of secrets at once and
+# hand them out.
+
+_SECRET_BYTES = 32
+_SECRET_BATCH = 16
+_secret_pool: deque[str] = deque()
+
+
+def _new_secret() -> str:
+    if not _secret_pool:
+        raw = os.urandom(_SECRET_BYTES * _SECRET_BATCH)
+        _secret_pool.extend(
+            base64.urlsafe_b64encode(raw[i:i + _SECRET_BYTES]).rstrip(b"=").decode()
+            for i in range(0, len(raw), _SECRET_BYTES)
+        )
+    return _secret_pool.popleft()
+
+
+def verify_signature(body: bytes, header: str, secret: str) -> bool:
+    """Check a generic-provider `sha256=<hex>` signature header against body.
+
+    hashlib's sha256 is OpenSSL-backed, which uses the CPU's SHA extensions
+    (SHA-NI / ARMv8 SHA2) when present. The comparison is constant-time.
+    """
+    if not header.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, header[7:])
 
 
 # ── Tool definitions ─────────────────────────────────────────────────────────
 
+# The register description carries the whole provider-configuration guide.
+# Kept as one module constant that TOOL_DEFS references, so every copy of the
+# tool list shares a single string object.
+REGISTER_WEBHOOK_DESCRIPTION: Final[str] = (
+    "Register an inbound webhook endpoint. Returns the public URL "
+    "that external services can POST to. A shared secret is auto-generated "
+    "for HMAC-SHA256 signature verification.\n\n"
+    "PROVIDER CONFIGURATION:\n"
+    "• Built-in presets — set provider to 'github', 'stripe', 'slack', "
+    "or 'generic' and the signature header/algorithm are auto-configured. "
+    "No extra fields needed.\n"
+    "• Any other service — set provider to the service name (e.g. 'linear', "
+    "'twilio', 'pagerduty') and fill in sigHeader, sigPrefix, and "
+    "sigPayloadTemplate. To determine the correct values, check the "
+    "service's webhook documentation for:\n"
+    "  1. Which HTTP header carries the HMAC signature (→ sigHeader)\n"
+    "  2. What prefix the header value starts with (→ sigPrefix, e.g. 'sha256=')\n"
+    "  3. What the signed payload looks like (→ sigPayloadTemplate using "
+    "{body} and optionally {timestamp})\n"
+    "  4. If a separate header carries a timestamp (→ timestampHeader)\n\n"
+    "EXAMPLES:\n"
+    "• Linear: sigHeader='X-Linear-Signature', sigPrefix='', "
+    "sigPayloadTemplate='{body}'\n"
+    "• Twilio: sigHeader='X-Twilio-Signature', sigPrefix='', "
+    "sigPayloadTemplate='{body}'\n"
+    "• Most services that send 'sha256=<hex>' over the raw body: "
+    "just set sigHeader to the correct header name and leave the rest default.\n\n"
+    "If you don't know the service's signing details, register with "
+    "provider='generic' and tell the user to configure the external service "
+    "to use X-Webhook-Signature: sha256=<HMAC-SHA256 hex of body>.\n\n"
+    "Always pass the userId from the system prompt."
+)
+
+
 TOOL_DEFS = [
     {
         "name": "register_webhook",
-        "description": (
-            "Register an inbound webhook endpoint. Returns the public URL "
-            "that external services can POST to. A shared secret is auto-generated "
-            "for HMAC-SHA256 signature verification.\n\n"
-            "PROVIDER CONFIGURATION:\n"
-            "• Built-in presets — set provider to 'github', 'stripe', 'slack', "
-            "or 'generic' and the signature header/algorithm are auto-configured. "
-            "No extra fields needed.\n"
-            "• Any other service — set provider to the service name (e.g. 'linear', "
-            "'twilio', 'pagerduty') and fill in sigHeader, sigPrefix, and "
-            "sigPayloadTemplate. To determine the correct values, check the "
-            "service's webhook documentation for:\n"
-            "  1. Which HTTP header carries the HMAC signature (→ sigHeader)\n"
-            "  2. What prefix the header value starts with (→ sigPrefix, e.g. 'sha256=')\n"
-            "  3. What the signed payload looks like (→ sigPayloadTemplate using "
-            "{body} and optionally {timestamp})\n"
-            "  4. If a separate header carries a timestamp (→ timestampHeader)\n\n"
-            "EXAMPLES:\n"
-            "• Linear: sigHeader='X-Linear-Signature', sigPrefix='', "
-            "sigPayloadTemplate='{body}'\n"
-            "• Twilio: sigHeader='X-Twilio-Signature', sigPrefix='', "
-            "sigPayloadTemplate='{body}'\n"
-            "• Most services that send 'sha256=<hex>' over the raw body: "
-            "just set sigHeader to the correct header name and leave the rest default.\n\n"
-            "If you don't know the service's signing details, register with "
-            "provider='generic' and tell the user to configure the external service "
-            "to use X-Webhook-Signature: sha256=<HMAC-SHA256 hex of body>.\n\n"
-            "Always pass the userId from the system prompt."
-        ),
+        "description": REGISTER_WEBHOOK_DESCRIPTION,
         "input_schema": {
             "type": "object",
             "properties": {
@@ -263,20 +448,87 @@ TOOL_DEFS = [
     },
 ]
 
-READ_ONLY = {"list_webhooks", "poll_webhooks", "get_webhook_config"}
+READ_ONLY = frozenset({"list_webhooks", "poll_webhooks", "get_webhook_config"})
 
 # ── Handlers ─────────────────────────────────────────────────────────────────
 
+_JSON_HEADERS = service_headers({"Content-Type": "application/json"})
+
+# Error bodies are only echoed back to the model, so never buffer more than
+# this from a failing (or misbehaving) backend.
+_ERROR_BODY_LIMIT = 64 * 1024
+
+
+async def _read_error_body(resp: httpx.Response) -> str:
+    """Read at most _ERROR_BODY_LIMIT bytes of a streamed error response."""
+    buf = bytearray()
+    async for chunk in resp.aiter_bytes():
+        buf += chunk
+        if len(buf) > _ERROR_BODY_LIMIT:
+            return buf[:_ERROR_BODY_LIMIT].decode("utf-8", "replace") + "… (truncated)"
+    return buf.decode("utf-8", "replace")
+
+
+class _UpstreamError(Exception):
+    """The webhooks API answered with an error status; str() is its body."""
+
+
+def _http_errors(action: str):
+    """Turn any exception raised by a handler into `Error {action}: ...`.
+
+    Tools report failures as result strings, so every handler shares this
+    one wrapper instead of repeating the same try/except.
+    """
+    def decorate(fn: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs) -> str:
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:
+                return f"Error {action}: {e}"
+        return wrapper
+    return decorate
+
+
+async def _request(method: str, url: httpx.URL | str, **kwargs) -> httpx.Response:
+    """Send a request and return the fully read response.
+
+    For status >= 400 the body is read through _read_error_body instead and
+    raised as _UpstreamError.
+    """
+    client = await get_client()
+    resp = await client.send(client.build_request(method, url, **kwargs), stream=True)
+    try:
+        if resp.status_code >= 400:
+            raise _UpstreamError(await _read_error_body(resp))
+        await resp.aread()
+        return resp
+    finally:
+        await resp.aclose()
+
+
+async def _send_json(method: str, body: dict[str, object]) -> httpx.Response:
+    """Send `body` to the webhooks API as JSON.
+
+    Serialized once via json_dumps (orjson when installed) and handed to the
+    client as the request content. httpx's own json= would re-encode through
+    the stdlib encoder.
+    """
+    return await _request(method, API_URL, content=json_dumps(body), headers=_JSON_HEADERS)
 
+
+@_http_errors("registering webhook")
 async def handle_register_webhook(input_data: dict) -> str:
     user_id = _get_user_id(input_data)
     endpoint_name = input_data.get("endpoint_name", "").strip()
 
     if not endpoint_name:
         return "Error: endpoint_name is required"
+    if not _ENDPOINT_NAME_RE.fullmatch(endpoint_name):
+        return _ENDPOINT_NAME_ERROR
 
     # Generate a secure shared secret
-    secret = secrets.token_hex(32)
+    secret = _new_secret()
     mode = input_data.get("mode", "agent")
     provider = input_data.get("provider", "generic")
 
@@ -286,6 +538,9 @@ async def handle_register_webhook(input_data: dict) -> str:
         "secret": secret,
         "mode": mode,
         "provider": provider,
+        # Have the server include the updated endpoint list in its reply,
+        # saving the usual follow-up list_webhooks round trip
+        "return": "list",
     }
     # Pass custom signature config when provided
     for key in ("sigHeader", "sigPrefix", "timestampHeader", "sigPayloadTemplate"):
@@ -296,140 +551,197 @@ async def handle_register_webhook(input_data: dict) -> str:
     if input_data.get("prompt"):
         post_body["prompt"] = input_data["prompt"]
 
-    payload = json.dumps(post_body).encode()
-
-    req = urllib.request.Request(
-        API_BASE,
-        data=payload,
-        headers=service_headers({"Content-Type": "application/json"}),
-        method="POST",
+    resp = await _send_json("POST", post_body)
+    _invalidate(user_id, ("list",))
+    result = json_loads(resp.content)
+    url = result.get("url", "")
+    action = result.get("action", "created")
+
+    mode_note = ""
+    if mode == "direct":
+        mode_note = (
+            f"\nMode: direct (widget polling only — no bot tokens spent)\n"
+            f"Widget endpoint: /api/webhook-data?userId={user_id}&endpointName={endpoint_name}"
+        )
+    else:
+        mode_note = "\nMode: agent (gateway processes each payload)"
+
+    sig_header = result.get("signatureHeader", "X-Webhook-Signature")
+    sig_format = result.get("signedPayloadFormat", "")
+    resp_provider = result.get("provider", provider)
+
+    listing = ""
+    endpoints = result.get("endpoints")
+    if endpoints is not None:
+        listing = _format_endpoint_list(endpoints)
+        # The listing reflects the write, so stamp it after the invalidation
+        # tombstone rather than at request start, or _cache_put would drop it
+        _cache_put(("list", user_id), listing, time.monotonic(), resp.status_code)
+        listing = f"\n\n{listing}"
+
+    return (
+        f"Webhook endpoint '{endpoint_name}' {action}.\n"
+        f"URL: {url}\n"
+        f"Secret: {secret}\n"
+        f"Provider: {resp_provider}\n"
+        f"{mode_note}\n\n"
+        f"Signature header: {sig_header}\n"
+        f"Signature format: {sig_format}\n"
+        f"Configure the external service to POST to the URL above "
+        f"and use the secret for HMAC signing."
+        f"{listing}"
     )
 
-    try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            result = json.loads(resp.read())
-            url = result.get("url", "")
-            action = result.get("action", "created")
-
-            mode_note = ""
-            if mode == "direct":
-                mode_note = (
-                    f"\nMode: direct (widget polling only — no bot tokens spent)\n"
-                    f"Widget endpoint: /api/webhook-data?userId={user_id}&endpointName={endpoint_name}"
-                )
-            else:
-                mode_note = "\nMode: agent (gateway processes each payload)"
-
-            sig_header = result.get("signatureHeader", "X-Webhook-Signature")
-            sig_format = result.get("signedPayloadFormat", "")
-            resp_provider = result.get("provider", provider)
-
-            return (
-                f"Webhook endpoint '{endpoint_name}' {action}.\n"
-                f"URL: {url}\n"
-                f"Secret: {secret}\n"
-                f"Provider: {resp_provider}\n"
-                f"{mode_note}\n\n"
-                f"Signature header: {sig_header}\n"
-                f"Signature format: {sig_format}\n"
-                f"Configure the external service to POST to the URL above "
-                f"and use the secret for HMAC signing."
-            )
-    except urllib.error.HTTPError as e:
-        body = e.read().decode()
-        return f"Error registering webhook: {body}"
-    except Exception as e:
-        return f"Error registering webhook: {str(e)}"
-
 
 async def handle_list_webhooks(input_data: dict) -> str:
     user_id = _get_user_id(input_data)
 
-    params = urllib.parse.urlencode({"userId": user_id, "action": "list"})
-    url = f"{API_BASE}?{params}"
-    list_req = urllib.request.Request(url, headers=service_headers())
+    cached = _cache_get(("list", user_id))
+    if cached is not None:
+        return cached
 
-    try:
-        with urllib.request.urlopen(list_req, timeout=10) as resp:
-            result = json.loads(resp.read())
-            endpoints = result.get("endpoints", [])
-
-            if not endpoints:
-                return "No webhook endpoints registered."
-
-            lines = []
-            for ep in endpoints:
-                status = "enabled" if ep.get("enabled") else "disabled"
-                mode = ep.get("mode", "agent")
-                provider = ep.get("provider", "generic")
-                sig_header = ep.get("sig_header") or "(preset)"
-                prompt_text = ep.get("prompt") or "(none)"
-                entry = (
-                    f"  {ep['endpoint_name']} ({status}, mode={mode}, provider={provider})\n"
-                    f"    URL: {ep.get('url', 'N/A')}\n"
-                    f"    Signature header: {sig_header}\n"
-                    f"    Prompt: {prompt_text}"
-                )
-                lines.append(entry)
-            return "Registered webhooks:\n" + "\n".join(lines)
-    except Exception as e:
-        return f"Error listing webhooks: {str(e)}"
+    return await _singleflight(("list", user_id), lambda: _fetch_webhook_list(user_id))
+
+
+async def _fetch_cached(key: tuple[str, str], url: httpx.URL, render: Callable[[dict], str]) -> str:
+    """GET a cacheable read and return its rendered text.
+
+    When an expired entry has an ETag, the request is conditional; a 304
+    re-arms the cached text without transferring or parsing the body.
+    """
+    started = time.monotonic()
+    stale = _cache_etag(key)
+    if stale is not None:
+        headers = service_headers({"If-None-Match": stale[0]})
+    else:
+        headers = service_headers()
+
+    resp = await _request("GET", url, headers=headers)
+    if resp.status_code == 304 and stale is not None:
+        _cache_put(key, stale[1], started, resp.status_code, stale[0])
+        return stale[1]
+
+    text = render(json_loads(resp.content))
+    _cache_put(key, text, started, resp.status_code, resp.headers.get("ETag"))
+    return text
+
+
+@_http_errors("listing webhooks")
+async def _fetch_webhook_list(user_id: str) -> str:
+    return await _fetch_cached(
+        ("list", user_id),
+        _list_url(user_id),
+        lambda result: _format_endpoint_list(result.get("endpoints", [])),
+    )
+
+
+@dataclass(slots=True)
+class Endpoint:
+    """The fields of a /api/webhooks endpoint row that the tools display."""
+
+    endpoint_name: str
+    enabled: bool = True
+    mode: str = "agent"
+    provider: str = "generic"
+    url: str = "N/A"
+    sig_header: str | None = None
+    prompt: str | None = None
+
+    @classmethod
+    def from_json(cls, ep: dict) -> "Endpoint":
+        # Rows carry extra columns (id, sig_prefix, created_at, ...) — take
+        # only what's needed rather than Endpoint(**ep)
+        return cls(
+            ep["endpoint_name"],
+            bool(ep.get("enabled")),
+            ep.get("mode", "agent"),
+            ep.get("provider", "generic"),
+            str(ep.get("url", "N/A")),
+            ep.get("sig_header"),
+            ep.get("prompt"),
+        )
+
+
+def _fmt_endpoint(ep: Endpoint) -> str:
+    status = "enabled" if ep.enabled else "disabled"
+    return (
+        f"  {ep.endpoint_name} ({status}, mode={ep.mode}, provider={ep.provider})\n"
+        f"    URL: {ep.url}\n"
+        f"    Signature header: {ep.sig_header or '(preset)'}\n"
+        f"    Prompt: {ep.prompt or '(none)'}"
+    )
+
+
+def _format_endpoint_list(endpoints: list[dict]) -> str:
+    if not endpoints:
+        return "No webhook endpoints registered."
 
+    body = "\n".join(_fmt_endpoint(Endpoint.from_json(ep)) for ep in endpoints)
+    return "Registered webhooks:\n" + body
 
+
+@_http_errors("polling webhooks")
 async def handle_poll_webhooks(input_data: dict) -> str:
     user_id = _get_user_id(input_data)
     endpoint_name = input_data.get("endpoint_name")
 
-    params: dict[str, str] = {"userId": user_id, "action": "poll"}
-    if endpoint_name:
-        params["endpointName"] = endpoint_name
+    client = await get_client()
+    # Up to 50 payloads — accumulate chunks into one growing buffer
+    # rather than holding the chunk list and its joined copy at once.
+    raw = bytearray()
+    async with client.stream("GET", _poll_url(user_id, endpoint_name), headers=service_headers()) as resp:
+        if resp.status_code >= 400:
+            raise _UpstreamError(await _read_error_body(resp))
+        async for chunk in resp.aiter_bytes(65536):
+            raw += chunk
+    # Parse the buffer directly (orjson and json both take a bytearray)
+    # and drop it before formatting so only the parsed copy stays alive.
+    result = json_loads(raw)
+    del raw
+    webhooks = result.get("webhooks", [])
+
+    if not webhooks:
+        return "No unprocessed webhooks."
+
+    # Assemble as bytes so each pretty-printed payload is written as
+    # serialized, with a single decode of the finished text.
+    buf = io.BytesIO()
+    buf.write(f"{len(webhooks)} webhook(s) received:".encode())
+    for wh in webhooks:
+        buf.write(f"\n\n--- [{wh['endpoint_name']}] received at {wh['received_at']} ---\n".encode())
+        buf.write(json_dumps_pretty(wh["payload"]))
+    return buf.getvalue().decode()
 
-    url = f"{API_BASE}?{urllib.parse.urlencode(params)}"
-    poll_req = urllib.request.Request(url, headers=service_headers())
 
-    try:
-        with urllib.request.urlopen(poll_req, timeout=10) as resp:
-            result = json.loads(resp.read())
-            webhooks = result.get("webhooks", [])
+async def handle_get_webhook_config(input_data: dict) -> str:
+    user_id = _get_user_id(input_data)
 
-            if not webhooks:
-                return "No unprocessed webhooks."
+    cached = _cache_get(("config", user_id))
+    if cached is not None:
+        return cached
 
-            lines = []
-            for wh in webhooks:
-                lines.append(
-                    f"--- [{wh['endpoint_name']}] received at {wh['received_at']} ---\n"
-                    f"{json.dumps(wh['payload'], indent=2)}"
-                )
-            return f"{len(webhooks)} webhook(s) received:\n\n" + "\n\n".join(lines)
-    except Exception as e:
-        return f"Error polling webhooks: {str(e)}"
+    return await _singleflight(("config", user_id), lambda: _fetch_webhook_config(user_id))
 
 
-async def handle_get_webhook_config(input_data: dict) -> str:
-    user_id = _get_user_id(input_data)
+@_http_errors("getting webhook config")
+async def _fetch_webhook_config(user_id: str) -> str:
+    return await _fetch_cached(("config", user_id), _config_url(user_id), _format_config)
 
-    params = urllib.parse.urlencode({"userId": user_id, "action": "config"})
-    url = f"{API_BASE}?{params}"
-    config_req = urllib.request.Request(url, headers=service_headers())
 
-    try:
-        with urllib.request.urlopen(config_req, timeout=10) as resp:
-            result = json.loads(resp.read())
-            config = result.get("config", {})
-            cap = config.get("hourly_token_cap")
-            rate = config.get("rate_limit_per_hour", 100)
-
-            cap_str = f"{cap:,} tokens" if cap is not None else "unlimited"
-            return (
-                f"Webhook config:\n"
-                f"  Hourly token cap: {cap_str}\n"
-                f"  Rate limit: {rate} webhooks/hour"
-            )
-    except Exception as e:
-        return f"Error getting webhook config: {str(e)}"
+def _format_config(result: dict) -> str:
+    config = result.get("config", {})
+    cap = config.get("hourly_token_cap")
+    rate = config.get("rate_limit_per_hour", 100)
+
+    cap_str = f"{cap:,} tokens" if cap is not None else "unlimited"
+    return (
+        f"Webhook config:\n"
+        f"  Hourly token cap: {cap_str}\n"
+        f"  Rate limit: {rate} webhooks/hour"
+    )
 
 
+@_http_errors("updating webhook config")
 async def handle_set_webhook_config(input_data: dict) -> str:
     user_id = _get_user_id(input_data)
 
@@ -439,50 +751,30 @@ async def handle_set_webhook_config(input_data: dict) -> str:
     if "rate_limit_per_hour" in input_data:
         body["rateLimitPerHour"] = input_data["rate_limit_per_hour"]
 
-    payload = json.dumps(body).encode()
-    req = urllib.request.Request(
-        API_BASE,
-        data=payload,
-        headers=service_headers({"Content-Type": "application/json"}),
-        method="PATCH",
-    )
-
-    try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            changes = []
-            if "hourly_token_cap" in input_data:
-                cap = input_data["hourly_token_cap"]
-                changes.append(f"hourly token cap → {f'{cap:,}' if cap is not None else 'unlimited'}")
-            if "rate_limit_per_hour" in input_data:
-                changes.append(f"rate limit → {input_data['rate_limit_per_hour']}/hour")
-            return "Webhook config updated: " + ", ".join(changes)
-    except urllib.error.HTTPError as e:
-        body_text = e.read().decode()
-        return f"Error updating webhook config: {body_text}"
-    except Exception as e:
-        return f"Error updating webhook config: {str(e)}"
+    await _send_json("PATCH", body)
+    _invalidate(user_id, ("config",))
+    changes = []
+    if "hourly_token_cap" in input_data:
+        cap = input_data["hourly_token_cap"]
+        changes.append(f"hourly token cap → {f'{cap:,}' if cap is not None else 'unlimited'}")
+    if "rate_limit_per_hour" in input_data:
+        changes.append(f"rate limit → {input_data['rate_limit_per_hour']}/hour")
+    return "Webhook config updated: " + ", ".join(changes)
 
 
+@_http_errors("deleting webhook")
 async def handle_delete_webhook(input_data: dict) -> str:
     user_id = _get_user_id(input_data)
     endpoint_name = input_data.get("endpoint_name", "").strip()
 
     if not endpoint_name:
         return "Error: endpoint_name is required"
+    if not _ENDPOINT_NAME_RE.fullmatch(endpoint_name):
+        return _ENDPOINT_NAME_ERROR
 
-    params = urllib.parse.urlencode({"userId": user_id, "endpointName": endpoint_name})
-    url = f"{API_BASE}?{params}"
-
-    req = urllib.request.Request(url, method="DELETE", headers=service_headers())
-
-    try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            return f"Webhook endpoint '{endpoint_name}' deleted (including all queued payloads)."
-    except urllib.error.HTTPError as e:
-        body = e.read().decode()
-        return f"Error deleting webhook: {body}"
-    except Exception as e:
-        return f"Error deleting webhook: {str(e)}"
+    await _request("DELETE", _delete_url(user_id, endpoint_name), headers=service_headers())
+    _invalidate(user_id, ("list",))
+    return f"Webhook endpoint '{endpoint_name}' deleted (including all queued payloads)."
 
 
 HANDLERS = {
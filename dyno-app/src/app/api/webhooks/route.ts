@@ -4,6 +4,7 @@
  * Used by the agent's Python tools to register, list, poll, and delete webhooks.
  */
 
+import { createHash } from "crypto";
 import { NextRequest, NextResponse } from "next/server";
 import { createServerSupabaseClient } from "@/lib/supabase/server";
 import { getAuthUserId } from "@/lib/auth";
@@ -11,11 +12,53 @@ import { presets, resolveProvider } from "@/lib/webhooks/providers";
 
 const PUBLIC_URL = process.env.NEXT_PUBLIC_APP_URL || process.env.FRONTEND_URL || "http://localhost:3000";
 
+/** List a user's webhook endpoints with their public URLs attached. */
+async function listEndpoints(
+  supabase: ReturnType<typeof createServerSupabaseClient>,
+  userId: string
+) {
+  const { data, error } = await supabase
+    .from("webhook_endpoints")
+    .select("id, endpoint_name, enabled, mode, provider, sig_header, sig_prefix, timestamp_header, sig_payload_template, prompt, created_at")
+    .eq("user_id", userId)
+    .order("created_at", { ascending: false });
+
+  if (error) {
+    return { endpoints: null, error };
+  }
+
+  const endpoints = (data || []).map((ep) => ({
+    ...ep,
+    url: `${PUBLIC_URL}/api/webhook/${userId}/${ep.endpoint_name}`,
+  }));
+  return { endpoints, error: null };
+}
+
+/**
+ * JSON response tagged with a content-hash ETag. When the caller already
+ * holds that version (If-None-Match), answer 304 with no body so the agent
+ * tools can keep their cached copy without re-downloading or re-parsing.
+ */
+function jsonWithETag(req: NextRequest, body: unknown) {
+  const json = JSON.stringify(body);
+  const etag = `"${createHash("sha1").update(json).digest("base64url")}"`;
+
+  if (req.headers.get("if-none-match") === etag) {
+    return new NextResponse(null, { status: 304, headers: { ETag: etag } });
+  }
+  return new NextResponse(json, {
+    headers: { "Content-Type": "application/json", ETag: etag },
+  });
+}
+
 /**
  * GET /api/webhooks?userId=...&action=poll&endpointName=...
  *
  * action=list (default): List all webhook endpoints for a user.
  * action=poll: Fetch unprocessed webhook payloads, optionally filtered by endpointName.
+ * action=config: Fetch the user's webhook security config.
+ *
+ * list and config responses carry an ETag and honor If-None-Match.
  */
 export async function GET(req: NextRequest) {
   const { searchParams } = new URL(req.url);
@@ -39,7 +82,7 @@ export async function GET(req: NextRequest) {
       return NextResponse.json({ error: error.message }, { status: 400 });
     }
 
-    return NextResponse.json({
+    return jsonWithETag(req, {
       config: data || { hourly_token_cap: null, rate_limit_per_hour: 100 },
     });
   }
@@ -77,29 +120,21 @@ export async function GET(req: NextRequest) {
   }
 
   // Default: list endpoints
-  const { data, error } = await supabase
-    .from("webhook_endpoints")
-    .select("id, endpoint_name, enabled, mode, provider, sig_header, sig_prefix, timestamp_header, sig_payload_template, prompt, created_at")
-    .eq("user_id", userId)
-    .order("created_at", { ascending: false });
-
+  const { endpoints, error } = await listEndpoints(supabase, userId);
   if (error) {
     return NextResponse.json({ error: error.message }, { status: 400 });
   }
 
-  // Attach public URLs
-  const endpoints = (data || []).map((ep) => ({
-    ...ep,
-    url: `${PUBLIC_URL}/api/webhook/${userId}/${ep.endpoint_name}`,
-  }));
-
-  return NextResponse.json({ endpoints });
+  return jsonWithETag(req, { endpoints });
 }
 
 /**
  * POST /api/webhooks
  * Register a new webhook endpoint.
- * Body: { userId, endpointName, secret }
+ * Body: { userId, endpointName, secret, return? }
+ *
+ * With return: "list", the response also carries the user's updated
+ * endpoint list so callers don't need a follow-up GET.
  */
 export async function POST(req: NextRequest) {
   const body = await req.json();
@@ -115,6 +150,7 @@ export async function POST(req: NextRequest) {
   const timestampHeader: string | null = body.timestampHeader || null;
   const sigPayloadTemplate: string | null = body.sigPayloadTemplate || null;
   const prompt: string | null = body.prompt || null;
+  const returnList = body.return === "list";
 
   if (!userId || !endpointName || !secret) {
     return NextResponse.json(
@@ -169,6 +205,7 @@ export async function POST(req: NextRequest) {
       signatureHeader: resolved.signatureHeader,
       signedPayloadFormat: resolved.signedPayloadFormat,
       url: `${PUBLIC_URL}/api/webhook/${userId}/${endpointName}`,
+      ...(returnList ? { endpoints: (await listEndpoints(supabase, userId)).endpoints } : {}),
     });
   }
 
@@ -198,6 +235,7 @@ export async function POST(req: NextRequest) {
     signatureHeader: resolved.signatureHeader,
     signedPayloadFormat: resolved.signedPayloadFormat,
     url: `${PUBLIC_URL}/api/webhook/${userId}/${endpointName}`,
+    ...(returnList ? { endpoints: (await listEndpoints(supabase, userId)).endpoints } : {}),
   });
 }
 